@@ -2,16 +2,30 @@
 FastAPI Backend Server for ISMIS Course Scheduler
 Provides REST API endpoints for the React frontend
 """
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 import uvicorn
-import json
+import asyncio
+import gzip
+import hashlib
+import logging
+import re
+import multiprocessing
+import orjson
 import os
 import time
+import traceback
 import uuid
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache, partial
 from typing import Dict, List, Optional
 from datetime import datetime
+from email.utils import formatdate, parsedate_to_datetime
+from pydantic import TypeAdapter
+import redis.asyncio as aioredis
 
 from models import (
     LoginRequest,
@@ -37,8 +51,12 @@ from ismis_scheduler import (
     generate_schedule_combinations,
     get_schedule_status,
     parse_schedule,
-    scrape_academic_options,
+    setup_page_optimizations_async,
+    json_scrape_async,
+    click_and_wait_for_new_rows,
+    scrape_academic_options_async,
 )
+from playwright.async_api import async_playwright, expect, TimeoutError as PlaywrightTimeoutError
 
 # ============================================================================
 # APP INITIALIZATION
@@ -48,6 +66,7 @@ app = FastAPI(
     title="ISMIS Course Scheduler API",
     description="Backend API for USC ISMIS Course Scheduling System",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # Enable CORS for frontend
@@ -69,38 +88,276 @@ app.add_middleware(
 # Store scraping tasks in memory (in production, use Redis or database)
 scraping_tasks: Dict[str, ScrapeStatus] = {}
 
+# Pool of shared Playwright browsers per headless mode, kept alive for the
+# lifetime of the process so scrapes don't pay a cold Chromium launch
+BROWSER_POOL_SIZE = max(1, int(os.getenv("BROWSER_POOL_SIZE", "1")))
+_playwright = None
+_browsers: Dict[bool, List] = {}
+_browser_lock = asyncio.Lock()
+
+# Cap on browser contexts open at once across all scrapes and logins
+MAX_BROWSER_CONTEXTS = int(os.getenv("MAX_BROWSER_CONTEXTS", "5"))
+_context_slots = asyncio.Semaphore(MAX_BROWSER_CONTEXTS)
+
+# Course pages scraped concurrently within one specific-courses task
+SCRAPE_PAGES_PER_TASK = int(os.getenv("SCRAPE_PAGES_PER_TASK", "4"))
+
+# How long a single-course search may take to render rows before it is treated
+# as "no results"; real hits render in a few seconds, misses leave tbody empty
+COURSE_SEARCH_TIMEOUT_MS = int(os.getenv("COURSE_SEARCH_TIMEOUT_MS", "15000"))
+
+# Worker processes for schedule generation (pure CPU work, so threads would
+# contend for the GIL); created lazily on the first /api/schedules/generate
+SCHEDULE_WORKERS = int(os.getenv("SCHEDULE_WORKERS", "2"))
+_schedule_pool: Optional[ProcessPoolExecutor] = None
+
+# Optional Redis mirror of scraping_tasks so any worker process can answer
+# status polls; enabled by setting REDIS_URL (e.g. redis://localhost:6379/0)
+REDIS_URL = os.getenv("REDIS_URL")
+TASK_STATUS_TTL = int(os.getenv("TASK_STATUS_TTL", "3600"))
+_redis = None
+
+# Scrapes wait in a bounded queue drained by a fixed number of consumers
+MAX_CONCURRENT_SCRAPES = int(os.getenv("MAX_CONCURRENT_SCRAPES", "4"))
+SCRAPE_QUEUE_SIZE = int(os.getenv("SCRAPE_QUEUE_SIZE", "16"))
+_scrape_queue: Optional[asyncio.Queue] = None
+
+# Logged-in browser storage states by login_session_key(), with expiry times
+LOGIN_SESSION_TTL = int(os.getenv("LOGIN_SESSION_TTL", "1800"))
+_login_sessions: Dict[str, tuple] = {}
+_session_key_secret = os.urandom(32)
+
+# Finished task statuses kept for polling before the oldest are dropped
+MAX_TRACKED_TASKS = int(os.getenv("MAX_TRACKED_TASKS", "256"))
+
+# Strong references to the queue consumers; the event loop only keeps weak
+# ones, so an unreferenced task could be garbage collected mid-scrape
+_scrape_jobs: set = set()
+
 # Path configuration
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 GENERATED_DIR = os.path.join(PROJECT_ROOT, "generated")
 JSON_DIR = os.path.join(GENERATED_DIR, "json")
 
+# Course files the API reads and lists; scrapes are saved gzipped when
+# COMPRESS_COURSE_FILES is set (compresslevel 1 keeps the write cheap)
+COURSE_FILE_SUFFIXES = (".json", ".json.gz")
+COMPRESS_COURSE_FILES = os.getenv("COMPRESS_COURSE_FILES", "").lower() in ("1", "true", "yes")
+
 # Ensure directories exist
 os.makedirs(JSON_DIR, exist_ok=True)
 
+# Academic period value -> filename prefix for saved scrapes
+PERIOD_FILE_NAMES = {
+    "FIRST_SEMESTER": "1st-Semester",
+    "SECOND_SEMESTER": "2nd-Semester",
+    "SUMMER": "Summer",
+    "FIRST_TRIMESTER": "1st-Trimester",
+    "SECOND_TRIMESTER": "2nd-Trimester",
+    "THIRD_TRIMESTER": "3rd-Trimester",
+    "TRANSITION_SEMESTER": "Transition-Term"
+}
+
+# Page title check after navigating to the course schedule page
+COURSE_SEARCH_URL = "https://ismis.usc.edu.ph/courseschedule/CourseScheduleOfferedIndex"
+ACADEMIC_MODULE_TITLE = re.compile("Academic Module", re.IGNORECASE)
+
+# Validates a whole course list in one call (faster than Course(**c) per item)
+_course_list_adapter = TypeAdapter(List[Course])
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
+def scan_json_files() -> List[os.DirEntry]:
+    """
+    List the JSON (and gzipped JSON) files in JSON_DIR in a single directory pass.
+    Blocking; call through asyncio.to_thread from async handlers.
+    """
+    with os.scandir(JSON_DIR) as it:
+        json_files = [e for e in it if e.name.endswith(COURSE_FILE_SUFFIXES) and e.is_file()]
+    # Stat while still off the event loop; DirEntry caches the result
+    for entry in json_files:
+        entry.stat()
+    return json_files
+
+
 def get_latest_courses_file() -> Optional[str]:
     """Find the most recently modified courses JSON file"""
     try:
-        json_files = [f for f in os.listdir(JSON_DIR) if f.endswith('.json')]
+        json_files = scan_json_files()
         if not json_files:
             return None
-        latest = max(json_files, key=lambda f: os.path.getmtime(os.path.join(JSON_DIR, f)))
-        return os.path.join(JSON_DIR, latest)
+        latest = max(json_files, key=lambda e: e.stat().st_mtime)
+        return latest.path
     except Exception:
         return None
 
 
-def load_courses_from_file(filename: Optional[str] = None) -> List[Dict]:
-    """Load courses from JSON file"""
+def file_version(stat: os.stat_result) -> tuple:
+    """
+    Cache key for a file's contents. Size is included alongside mtime_ns so a rewrite
+    landing within the filesystem's timestamp granularity is still noticed.
+    """
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+# File versions each per-file cache below keeps. Every re-scrape writes a new
+# multi-MB file, so only the current and the previous version are held; older
+# ones are evicted instead of living on as dicts, models, bytes and index.
+FILE_CACHE_VERSIONS = 2
+
+
+@lru_cache(maxsize=FILE_CACHE_VERSIONS)
+def _read_json_cached(filepath: str, version: tuple):
+    """Parse a JSON file once per (path, version); a rewritten file gets a new key"""
+    opener = gzip.open if filepath.endswith(".gz") else open
+    with opener(filepath, 'rb') as f:
+        return orjson.loads(f.read())
+
+
+def read_json_file(filepath: str):
+    """
+    Load a JSON file through the mtime-keyed cache.
+    The returned object is shared between requests and must not be mutated.
+    """
+    return _read_json_cached(filepath, file_version(os.stat(filepath)))
+
+
+def write_json_file(filepath: str, data):
+    """
+    Write data as indented JSON (blocking; run off the event loop).
+    Goes through a temp file and os.replace so readers never see a partial file;
+    a path ending in .gz is written gzipped.
+    """
+    tmp = filepath + ".tmp"
+    body = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    try:
+        if filepath.endswith(".gz"):
+            with gzip.open(tmp, 'wb', compresslevel=1) as f:
+                f.write(body)
+        else:
+            with open(tmp, 'wb') as f:
+                f.write(body)
+        os.replace(tmp, filepath)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def count_unique_codes(courses: List[Dict]) -> int:
+    """Count distinct course codes, ignoring the " - Group N" section suffix"""
+    return len({(c.get("code") or "").partition(" - Group")[0] for c in courses})
+
+
+@lru_cache(maxsize=FILE_CACHE_VERSIONS)
+def _course_models_cached(filepath: str, version: tuple) -> List[Course]:
+    """Validate a courses file into Course models once per file version"""
+    return _course_list_adapter.validate_python(_read_json_cached(filepath, version))
+
+
+@lru_cache(maxsize=2 * FILE_CACHE_VERSIONS)  # with and without last_updated
+def _courses_response_cached(filepath: str, version: tuple, with_timestamp: bool) -> bytes:
+    """Serialize the full CoursesResponse for one file version"""
+    courses_data = _read_json_cached(filepath, version)
+    last_updated = None
+    if with_timestamp:
+        last_updated = datetime.fromtimestamp(os.stat(filepath).st_mtime).isoformat()
+    response = CoursesResponse(
+        courses=_course_models_cached(filepath, version),
+        count=len(courses_data),
+        unique_codes=count_unique_codes(courses_data),
+        last_updated=last_updated
+    )
+    return orjson.dumps(response.model_dump(mode="json"))
+
+
+def file_cache_headers(stat: os.stat_result) -> Dict[str, str]:
+    """ETag / Last-Modified validators for a file, derived from its mtime and size"""
+    return {
+        "ETag": f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"',
+        "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+    }
+
+
+def not_modified_response(request: Request, filepath: str) -> Optional[Response]:
+    """
+    Return a 304 response if the client's cached copy of filepath is still current,
+    checked from the file's stat alone (no JSON is read). Blocking; run off the event loop.
+    """
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    headers = file_cache_headers(stat)
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        if "*" in tags or headers["ETag"] in tags or f"W/{headers['ETag']}" in tags:
+            return Response(status_code=304, headers=headers)
+        return None
+    
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            if int(stat.st_mtime) <= parsedate_to_datetime(if_modified_since).timestamp():
+                return Response(status_code=304, headers=headers)
+        except (TypeError, ValueError):
+            pass
+    return None
+
+
+def courses_response(filepath: str, with_timestamp: bool = False) -> Response:
+    """
+    Return a ready-made JSON response for a courses file.
+    The body is serialized once per file version and then served as raw bytes,
+    skipping per-request model validation and encoding.
+    """
+    stat = os.stat(filepath)
+    body = _courses_response_cached(filepath, file_version(stat), with_timestamp)
+    return Response(content=body, media_type="application/json", headers=file_cache_headers(stat))
+
+
+@lru_cache(maxsize=FILE_CACHE_VERSIONS)
+def _courses_index_cached(filepath: str, version: tuple) -> Dict[str, List[Dict]]:
+    """
+    Group the non-dissolved sections of one file version by course code.
+    Sections come from the validated Course models, so they carry exactly the Course fields.
+    """
+    courses_by_code = defaultdict(list)
+    for course in (c.model_dump() for c in _course_models_cached(filepath, version)):
+        get = course.get
+        if get("status", "").upper() == "DISSOLVED":
+            continue
+        
+        courses_by_code[get("code", "").partition(" - Group")[0]].append(course)
+    return dict(courses_by_code)
+
+
+def load_courses_index(filepath: str) -> Dict[str, List[Dict]]:
+    """
+    Return {course code: [sections]} for a courses file, skipping DISSOLVED sections.
+    The index is shared between requests and must not be mutated.
+    """
+    return _courses_index_cached(filepath, file_version(os.stat(filepath)))
+
+
+def resolve_courses_file(filename: Optional[str] = None) -> Optional[str]:
+    """Resolve a courses filename to a path in JSON_DIR (latest file when omitted)"""
     if filename is None:
-        filename = get_latest_courses_file()
-    elif not os.path.isabs(filename):
+        return get_latest_courses_file()
+    if not os.path.isabs(filename):
         # If filename is not an absolute path, assume it's in JSON_DIR
-        filename = os.path.join(JSON_DIR, filename)
+        return os.path.join(JSON_DIR, filename)
+    return filename
+
+
+def load_courses_from_file(filename: Optional[str] = None) -> List[Dict]:
+    """Load courses from JSON file"""
+    filename = resolve_courses_file(filename)
     
     if filename is None or not os.path.exists(filename):
         print(f"[ERROR] File not found: {filename}")
@@ -108,8 +365,7 @@ def load_courses_from_file(filename: Optional[str] = None) -> List[Dict]:
     
     try:
         print(f"[INFO] Loading courses from: {filename}")
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = read_json_file(filename)
         print(f"[INFO] Loaded {len(data)} courses")
         return data
     except Exception as e:
@@ -117,123 +373,407 @@ def load_courses_from_file(filename: Optional[str] = None) -> List[Dict]:
         return []
 
 
-def scrape_task_worker(task_id: str, request_data: dict, scrape_type: str):
+def load_courses_index_from_file(filename: Optional[str] = None) -> Optional[Dict[str, List[Dict]]]:
+    """
+    Resolve filename once (latest file when omitted) and return its course index,
+    or None when there is no courses data. Blocking; run off the event loop.
+    """
+    filepath = resolve_courses_file(filename)
+    if filepath is None or not load_courses_from_file(filepath):
+        return None
+    return load_courses_index(filepath)
+
+
+async def _launch_pooled_browser(headless: bool):
+    """Launch a browser into the pool (caller holds _browser_lock)"""
+    global _playwright
+    if _playwright is None:
+        _playwright = await async_playwright().start()
+    browser = await _playwright.chromium.launch(headless=headless)
+    _browsers.setdefault(headless, []).append(browser)
+    return browser
+
+
+async def get_shared_browser(headless: bool = True):
+    """
+    Return a pooled Chromium instance for the given headless mode.
+    Prefers the most recently used idle browser, launches another while the pool
+    is below BROWSER_POOL_SIZE, and otherwise picks the one with the fewest open
+    contexts. Crashed browsers are dropped from the pool.
+    """
+    async with _browser_lock:
+        pool = [b for b in _browsers.get(headless, []) if b.is_connected()]
+        _browsers[headless] = pool
+        
+        idle = [b for b in pool if not b.contexts]
+        if idle:
+            return idle[-1]
+        if len(pool) < BROWSER_POOL_SIZE:
+            return await _launch_pooled_browser(headless)
+        return min(pool, key=lambda b: len(b.contexts))
+
+
+async def warm_browser_pool(headless: bool = True):
+    """Fill the pool for the given mode up to BROWSER_POOL_SIZE"""
+    async with _browser_lock:
+        pool = [b for b in _browsers.get(headless, []) if b.is_connected()]
+        _browsers[headless] = pool
+        while len(pool) < BROWSER_POOL_SIZE:
+            await _launch_pooled_browser(headless)
+
+
+async def close_shared_browsers():
+    """Close every pooled browser and stop Playwright"""
+    global _playwright
+    for pool in _browsers.values():
+        for browser in pool:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+    _browsers.clear()
+    if _playwright is not None:
+        await _playwright.stop()
+        _playwright = None
+
+
+def login_session_key(username: str, password: str) -> str:
+    """
+    Key for a saved ISMIS session. Both credentials are hashed (with a per-process key)
+    so a session is only reused by a request that could have logged in itself.
+    """
+    digest = hashlib.blake2b(key=_session_key_secret, digest_size=16)
+    digest.update(f"{username}\0{password}".encode())
+    return digest.hexdigest()
+
+
+def get_login_session(session_key: str) -> Optional[dict]:
+    """Return a saved browser storage state if it hasn't expired"""
+    saved = _login_sessions.get(session_key)
+    if saved is None:
+        return None
+    state, expires_at = saved
+    if time.monotonic() >= expires_at:
+        del _login_sessions[session_key]
+        return None
+    return state
+
+
+def save_login_session(session_key: str, state: dict):
+    """Remember a logged-in storage state for LOGIN_SESSION_TTL seconds"""
+    now = time.monotonic()
+    for key in [k for k, (_, expires_at) in _login_sessions.items() if expires_at <= now]:
+        del _login_sessions[key]
+    _login_sessions[session_key] = (state, now + LOGIN_SESSION_TTL)
+
+
+@asynccontextmanager
+async def isolated_page(headless: bool = True, storage_state: Optional[dict] = None):
+    """
+    Yield a fresh page in its own browser context on the shared browser.
+    Contexts are capped by _context_slots; the context is closed on exit.
+    Pass storage_state to start the context with saved cookies (e.g. a login session).
+    """
+    async with _context_slots:
+        browser = await get_shared_browser(headless)
+        context = await browser.new_context(storage_state=storage_state)
+        try:
+            page = await context.new_page()
+            await setup_page_optimizations_async(page)
+            yield page
+        finally:
+            try:
+                await context.close()
+            except Exception:
+                pass
+
+
+async def open_course_search(page, academic_period: str, academic_year: str, navigate: bool = True):
+    """Open the course schedule page on a logged-in page and apply the term filters"""
+    if navigate:
+        await page.goto(COURSE_SEARCH_URL)
+    await expect(page).to_have_title(ACADEMIC_MODULE_TITLE)
+    
+    # Set filters
+    await page.locator("i.fa-calendar").click()
+    await page.locator("#AcademicPeriod").select_option(academic_period)
+    await page.locator("#AcademicYear").select_option(academic_year)
+
+
+async def scrape_specific_course(context, course_code: str, request_data: dict) -> List[Dict]:
+    """
+    Search one course on its own page in an already logged-in context.
+    Returns an empty list when the search has no results.
+    """
+    page = await context.new_page()
+    try:
+        await setup_page_optimizations_async(page)
+        await open_course_search(page, request_data["academic_period"], request_data["academic_year"])
+        await page.locator("#Courses").fill(course_code)
+        
+        # Wait for the result rows to render; a course not offered this term
+        # renders none, so fail fast instead of waiting out the page timeout
+        try:
+            await click_and_wait_for_new_rows(page, page.locator("i.fa-search"), timeout=COURSE_SEARCH_TIMEOUT_MS)
+        except PlaywrightTimeoutError:
+            print(f"No results found for {course_code}")
+            return []
+        try:
+            return await json_scrape_async(page)
+        except Exception as e:
+            print(f"[SCRAPE] Failed to read results for {course_code}: {e}")
+            return []
+    finally:
+        await page.close()
+
+
+async def scrape_task_worker(task_id: str, request_data: dict, scrape_type: str):
     """Background worker for scraping tasks"""
     try:
         # Update status to running
         scraping_tasks[task_id].status = "running"
         scraping_tasks[task_id].current_task = "Initializing browser..."
-        
-        # Import here to avoid circular imports
-        from playwright.sync_api import sync_playwright
-        from ismis_scheduler import (
-            setup_page_optimizations,
-            json_scrape,
-            polite_pause,
-        )
-        import re
-        from playwright.sync_api import expect
+        await publish_task_status(task_id)
         
         courses_data = []
         
         # Get headless mode from request, default to True if not specified
         headless_mode = request_data.get("headless", True)
         
-        with sync_playwright() as p:
-            # Launch browser with headless mode from settings
-            browser = p.chromium.launch(headless=headless_mode)
-            page = browser.new_page()
-            setup_page_optimizations(page)
-            
-            # Login
-            scraping_tasks[task_id].current_task = "Logging in..."
-            page.goto("https://ismis.usc.edu.ph/Account/Login?ReturnUrl=%2F")
-            page.locator("#Username").fill(request_data["username"])
-            page.locator("#Password").fill(request_data["password"])
-            page.get_by_role("button", name="Login").click()
-            page.locator("#Username").wait_for(state="hidden", timeout=45000)
-            polite_pause()
+        # Reuse a recent login for the same credentials when there is one
+        session_key = login_session_key(request_data["username"], request_data["password"])
+        saved_session = get_login_session(session_key)
+        
+        # Waits here if MAX_BROWSER_CONTEXTS pages are already open
+        async with isolated_page(headless_mode, storage_state=saved_session) as page:
+            resumed = False
+            if saved_session is not None:
+                scraping_tasks[task_id].current_task = "Resuming session..."
+                await publish_task_status(task_id)
+                await page.goto(COURSE_SEARCH_URL)
+                # An expired session is redirected back to the login form
+                resumed = "/Account/Login" not in page.url
             
+            if not resumed:
+                # Login
+                scraping_tasks[task_id].current_task = "Logging in..."
+                await publish_task_status(task_id)
+                await page.goto("https://ismis.usc.edu.ph/Account/Login?ReturnUrl=%2F")
+                await page.locator("#Username").fill(request_data["username"])
+                await page.locator("#Password").fill(request_data["password"])
+                await page.get_by_role("button", name="Login").click()
+                await page.locator("#Username").wait_for(state="hidden", timeout=45000)
+                save_login_session(session_key, await page.context.storage_state())
+        
             # Navigate to course schedule page
             scraping_tasks[task_id].current_task = "Navigating to courses..."
-            page.goto("https://ismis.usc.edu.ph/courseschedule/CourseScheduleOfferedIndex")
-            expect(page).to_have_title(re.compile("Academic Module", re.IGNORECASE))
-            
-            # Set filters
-            page.locator("i.fa-calendar").click()
-            page.locator("#AcademicPeriod").select_option(request_data["academic_period"])
-            page.locator("#AcademicYear").select_option(request_data["academic_year"])
-            
+            await publish_task_status(task_id)
+            await open_course_search(
+                page, request_data["academic_period"], request_data["academic_year"], navigate=not resumed
+            )
+        
             if scrape_type == "specific":
-                # Scrape specific courses
+                # Scrape specific courses, several at a time on pages sharing the login session
                 courses = request_data["courses"]
                 scraping_tasks[task_id].total = len(courses)
+                scraping_tasks[task_id].progress = 0
+                scraping_tasks[task_id].current_task = f"Scraping {len(courses)} courses..."
+                await publish_task_status(task_id)
                 
-                for idx, course_code in enumerate(courses):
-                    scraping_tasks[task_id].progress = idx
-                    scraping_tasks[task_id].current_task = f"Scraping {course_code}..."
-                    
-                    page.locator("#Courses").fill("")
-                    page.locator("#Courses").fill(course_code)
-                    page.locator("i.fa-search").click()
-                    
-                    # Wait for the table body to appear and check if we have results
-                    try:
-                        page.locator("tbody tr").first.wait_for(state="visible", timeout=45000)
-                        polite_pause()
-                        
-                        course_sections = json_scrape(page)
-                        courses_data.extend(course_sections)
-                    except Exception:
-                        # No results found for this course - continue to next one
-                        print(f"No results found for {course_code}")
-                        continue
+                page_slots = asyncio.Semaphore(SCRAPE_PAGES_PER_TASK)
                 
-                scraping_tasks[task_id].progress = len(courses)
+                async def scrape_course(course_code: str) -> List[Dict]:
+                    async with page_slots:
+                        try:
+                            return await scrape_specific_course(page.context, course_code, request_data)
+                        finally:
+                            scraping_tasks[task_id].progress += 1
+                            scraping_tasks[task_id].current_task = f"Scraped {course_code}"
+                            await publish_task_status(task_id)
                 
+                # gather keeps results in request order
+                for course_sections in await asyncio.gather(*(scrape_course(c) for c in courses)):
+                    courses_data.extend(course_sections)
+            
             else:  # scrape_type == "all"
                 # Scrape all courses
                 scraping_tasks[task_id].current_task = "Scraping all courses..."
-                page.locator("#Courses").fill("")
-                page.locator("i.fa-search").click()
-                page.locator("tbody tr").first.wait_for(state="visible", timeout=45000)
-                polite_pause()
-                
-                courses_data = json_scrape(page)
+                await publish_task_status(task_id)
+                await page.locator("#Courses").fill("")
+                await click_and_wait_for_new_rows(page, page.locator("i.fa-search"))
             
-            # Cleanup
-            browser.close()
-        
+                courses_data = await json_scrape_async(page)
+
         # Save to file
-        period_map = {
-            "FIRST_SEMESTER": "1st-Semester",
-            "SECOND_SEMESTER": "2nd-Semester",
-            "SUMMER": "Summer",
-            "FIRST_TRIMESTER": "1st-Trimester",
-            "SECOND_TRIMESTER": "2nd-Trimester",
-            "THIRD_TRIMESTER": "3rd-Trimester",
-            "TRANSITION_SEMESTER": "Transition-Term"
-        }
-        period_name = period_map.get(request_data["academic_period"], "courses")
+        period_name = PERIOD_FILE_NAMES.get(request_data["academic_period"], "courses")
         
         # Include scrape type in filename to prevent overwriting
         scrape_type_suffix = "_specific" if scrape_type == "specific" else "_all"
         filename = os.path.join(JSON_DIR, f"{period_name}_{request_data['academic_year']}{scrape_type_suffix}.json")
+        if COMPRESS_COURSE_FILES:
+            filename += ".gz"
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(courses_data, f, indent=2, ensure_ascii=False)
+        await asyncio.to_thread(write_json_file, filename, courses_data)
         
         print(f"[SCRAPE SUCCESS] Saved {len(courses_data)} courses to {filename}")
         
         # Update status to completed
         scraping_tasks[task_id].status = "completed"
         scraping_tasks[task_id].current_task = "Done!"
-        scraping_tasks[task_id].courses = [Course(**c) for c in courses_data]
+        # Rows come from course_from_cells, so every field is already a str
+        scraping_tasks[task_id].courses = [Course.model_construct(**c) for c in courses_data]
         scraping_tasks[task_id].saved_file = os.path.basename(filename)  # Store the filename
+        await publish_task_status(task_id)
         
     except Exception as e:
         scraping_tasks[task_id].status = "failed"
         scraping_tasks[task_id].error = str(e)
+        await publish_task_status(task_id)
+
+
+async def publish_task_status(task_id: str):
+    """Mirror a task's current status to Redis (no-op when REDIS_URL is unset)"""
+    if _redis is None:
+        return
+    try:
+        await _redis.set(f"task:{task_id}", scraping_tasks[task_id].model_dump_json(), ex=TASK_STATUS_TTL)
+    except Exception as e:
+        print(f"[WARN] Could not publish status for task {task_id}: {e}")
+
+
+def get_schedule_pool() -> ProcessPoolExecutor:
+    """Return the process pool for schedule generation, creating it on first use"""
+    global _schedule_pool
+    if _schedule_pool is None:
+        # spawn, not fork: forking a process that already runs threads can deadlock
+        _schedule_pool = ProcessPoolExecutor(
+            max_workers=SCHEDULE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _schedule_pool
+
+
+def schedule_combination_dicts(combinations_raw: List[List[Dict]]) -> List[Dict]:
+    """Plain-dict equivalent of build_schedule_combinations for direct serialization"""
+    return [{"courses": combo, **get_schedule_status(combo)} for combo in combinations_raw]
+
+
+def build_schedule_combinations(combinations_raw: List[List[Dict]]) -> List[ScheduleCombination]:
+    """Wrap raw combinations in response models with their availability status"""
+    combinations = []
+    # A section shows up in many combinations; validate it once and share the
+    # (frozen) model. Keyed by id() since combinations_raw keeps the dicts alive.
+    course_models = {}
+    for i, combo in enumerate(combinations_raw):
+        try:
+            status_info = get_schedule_status(combo)
+            courses = []
+            for c in combo:
+                model = course_models.get(id(c))
+                if model is None:
+                    model = course_models[id(c)] = Course.model_validate(c)
+                courses.append(model)
+            combinations.append(ScheduleCombination(
+                courses=courses,
+                status=status_info["status"],
+                full_courses=status_info["full_courses"]
+            ))
+        except Exception as e:
+            print(f"[ERROR] Failed to process combination {i}: {str(e)}")
+            print(f"[DEBUG] Combo data: {combo}")
+            traceback.print_exc()
+            raise
+    return combinations
+
+
+async def scrape_consumer():
+    """Pull queued scrapes and run them one at a time"""
+    while True:
+        task_id, request_data, scrape_type = await _scrape_queue.get()
+        try:
+            await scrape_task_worker(task_id, request_data, scrape_type)
+        finally:
+            _scrape_queue.task_done()
+
+
+def enqueue_scrape_job(task_id: str, request_data: dict, scrape_type: str):
+    """
+    Queue a scrape and return immediately; at most MAX_CONCURRENT_SCRAPES run at once.
+    The queue and its consumers are created on first use inside the running loop.
+    Raises asyncio.QueueFull when SCRAPE_QUEUE_SIZE jobs are already waiting.
+    """
+    global _scrape_queue
+    if _scrape_queue is None:
+        _scrape_queue = asyncio.Queue(maxsize=SCRAPE_QUEUE_SIZE)
+        for _ in range(MAX_CONCURRENT_SCRAPES):
+            consumer = asyncio.create_task(scrape_consumer())
+            _scrape_jobs.add(consumer)
+            consumer.add_done_callback(_scrape_jobs.discard)
+    _scrape_queue.put_nowait((task_id, request_data, scrape_type))
+
+
+def prune_scraping_tasks():
+    """Forget the oldest finished tasks once more than MAX_TRACKED_TASKS are stored"""
+    excess = len(scraping_tasks) - MAX_TRACKED_TASKS
+    if excess <= 0:
+        return
+    # Dicts keep insertion order, so this walks from the oldest task
+    finished = [task_id for task_id, task in scraping_tasks.items()
+                if task.status in ("completed", "failed")]
+    for task_id in finished[:excess]:
+        del scraping_tasks[task_id]
+
+
+def start_scrape_task(task_id: str, request_data: dict, scrape_type: str):
+    """Queue a scrape whose status is already in scraping_tasks, or reject it with 503"""
+    try:
+        enqueue_scrape_job(task_id, request_data, scrape_type)
+    except asyncio.QueueFull:
+        del scraping_tasks[task_id]
+        raise HTTPException(status_code=503, detail="Too many scrapes queued, try again shortly")
+    prune_scraping_tasks()
+
+
+# ============================================================================
+# LIFECYCLE
+# ============================================================================
+
+@app.on_event("startup")
+async def connect_task_store():
+    """Connect to Redis for shared task status if REDIS_URL is configured"""
+    global _redis
+    if not REDIS_URL:
+        return
+    try:
+        _redis = aioredis.from_url(REDIS_URL)
+        await _redis.ping()
+        print("[INFO] Sharing scrape task status via Redis")
+    except Exception as e:
+        _redis = None
+        print(f"[WARN] Redis unavailable, task status stays in-process: {e}")
+
+
+@app.on_event("startup")
+async def warm_up_browser():
+    """Launch the headless browser pool so the first scrape starts warm"""
+    try:
+        await warm_browser_pool(headless=True)
+    except Exception as e:
+        print(f"[WARN] Could not launch shared browser at startup: {e}")
+
+
+@app.on_event("shutdown")
+async def shutdown_browser():
+    """Stop the scrape consumers and close the shared browser when the server stops"""
+    for job in list(_scrape_jobs):
+        job.cancel()
+    if _scrape_jobs:
+        await asyncio.gather(*_scrape_jobs, return_exceptions=True)
+    await close_shared_browsers()
+    if _redis is not None:
+        await _redis.aclose()
+    if _schedule_pool is not None:
+        _schedule_pool.shutdown(cancel_futures=True)
 
 
 # ============================================================================
@@ -293,19 +833,13 @@ async def login_and_get_options(request: LoginRequest):
     Login to ISMIS and retrieve available academic periods and years.
     This separates the login process from scraping to get real-time options.
     """
-    import asyncio
-    from concurrent.futures import ThreadPoolExecutor
-    
     try:
-        # Run the synchronous Playwright function in a thread pool
-        loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor() as executor:
-            options_data = await loop.run_in_executor(
-                executor,
-                scrape_academic_options,
-                request.username,
-                request.password,
-                True  # headless
+        async with isolated_page(headless=True) as page:
+            options_data = await scrape_academic_options_async(page, request.username, request.password)
+            # Let the scrape that usually follows skip its own login
+            save_login_session(
+                login_session_key(request.username, request.password),
+                await page.context.storage_state()
             )
         
         return LoginResponse(
@@ -321,8 +855,7 @@ async def login_and_get_options(request: LoginRequest):
 
 @app.post("/api/scrape/specific", response_model=ScrapeResponse)
 async def scrape_specific_courses(
-    request: ScrapeSpecificRequest,
-    background_tasks: BackgroundTasks
+    request: ScrapeSpecificRequest
 ):
     """Scrape specific courses from ISMIS"""
     task_id = str(uuid.uuid4())
@@ -336,13 +869,9 @@ async def scrape_specific_courses(
         current_task="Queued"
     )
     
-    # Start background task
-    background_tasks.add_task(
-        scrape_task_worker,
-        task_id,
-        request.model_dump(),
-        "specific"
-    )
+    # Queue the scrape (503 if the queue is full)
+    start_scrape_task(task_id, request.model_dump(), "specific")
+    await publish_task_status(task_id)
     
     return ScrapeResponse(
         task_id=task_id,
@@ -353,8 +882,7 @@ async def scrape_specific_courses(
 
 @app.post("/api/scrape/all", response_model=ScrapeResponse)
 async def scrape_all_courses(
-    request: ScrapeAllRequest,
-    background_tasks: BackgroundTasks
+    request: ScrapeAllRequest
 ):
     """Scrape all courses from ISMIS"""
     task_id = str(uuid.uuid4())
@@ -366,13 +894,9 @@ async def scrape_all_courses(
         current_task="Queued"
     )
     
-    # Start background task
-    background_tasks.add_task(
-        scrape_task_worker,
-        task_id,
-        request.model_dump(),
-        "all"
-    )
+    # Queue the scrape (503 if the queue is full)
+    start_scrape_task(task_id, request.model_dump(), "all")
+    await publish_task_status(task_id)
     
     return ScrapeResponse(
         task_id=task_id,
@@ -384,62 +908,50 @@ async def scrape_all_courses(
 @app.get("/api/scrape/status/{task_id}", response_model=ScrapeStatus)
 async def get_scrape_status(task_id: str):
     """Get status of a scraping task"""
-    if task_id not in scraping_tasks:
-        raise HTTPException(status_code=404, detail="Task not found")
+    if task_id in scraping_tasks:
+        return scraping_tasks[task_id]
+    
+    # The task may be running in another worker process
+    if _redis is not None:
+        data = await _redis.get(f"task:{task_id}")
+        if data is not None:
+            return ScrapeStatus.model_validate_json(data)
     
-    return scraping_tasks[task_id]
+    raise HTTPException(status_code=404, detail="Task not found")
 
 
 @app.get("/api/courses", response_model=CoursesResponse)
-async def get_courses(filename: Optional[str] = None):
+async def get_courses(request: Request, filename: Optional[str] = None):
     """Get scraped courses from JSON file"""
-    courses_data = load_courses_from_file(filename)
+    # Path resolution, stats, disk reads and JSON parsing run in a thread so the
+    # event loop stays free; the path is resolved once and reused below
+    filepath = await asyncio.to_thread(resolve_courses_file, filename)
+    if filepath:
+        cached = await asyncio.to_thread(not_modified_response, request, filepath)
+        if cached is not None:
+            return cached
+    
+    courses_data = await asyncio.to_thread(load_courses_from_file, filepath) if filepath else []
     
     if not courses_data:
         return CoursesResponse(courses=[], count=0, unique_codes=0)
     
-    # Count unique course codes (without group numbers)
-    unique_codes = set()
-    for course in courses_data:
-        code = course.get("code", "").split(" - Group")[0]
-        unique_codes.add(code)
-    
-    return CoursesResponse(
-        courses=[Course(**c) for c in courses_data],
-        count=len(courses_data),
-        unique_codes=len(unique_codes)
-    )
+    return await asyncio.to_thread(courses_response, filepath)
 
 
 @app.get("/api/courses/cached", response_model=CoursesResponse)
-async def get_cached_courses():
+async def get_cached_courses(request: Request):
     """Get the most recently cached courses (instant load, no scraping required)"""
-    courses_data = load_courses_from_file()
-    
-    last_updated = None
-    
-    if courses_data:
-        # Get the file's modification time
-        json_file = get_latest_courses_file()
-        if json_file and os.path.exists(json_file):
-            try:
-                mod_time = os.path.getmtime(json_file)
-                last_updated = datetime.fromtimestamp(mod_time).isoformat()
-            except Exception:
-                pass
+    latest = await asyncio.to_thread(get_latest_courses_file)
+    if latest:
+        cached = await asyncio.to_thread(not_modified_response, request, latest)
+        if cached is not None:
+            return cached
         
-        # Count unique course codes (without group numbers)
-        unique_codes = set()
-        for course in courses_data:
-            code = course.get("code", "").split(" - Group")[0]
-            unique_codes.add(code)
+        courses_data = await asyncio.to_thread(load_courses_from_file, latest)
         
-        return CoursesResponse(
-            courses=[Course(**c) for c in courses_data],
-            count=len(courses_data),
-            unique_codes=len(unique_codes),
-            last_updated=last_updated
-        )
+        if courses_data and os.path.exists(latest):
+            return await asyncio.to_thread(courses_response, latest, True)
     
     return CoursesResponse(
         courses=[],
@@ -450,49 +962,40 @@ async def get_cached_courses():
 
 
 @app.post("/api/schedules/generate", response_model=GenerateSchedulesResponse)
-async def generate_schedules(request: GenerateSchedulesRequest):
-    """Generate schedule combinations from selected courses"""
+async def generate_schedules(request: GenerateSchedulesRequest, validate: bool = False):
+    """
+    Generate schedule combinations from selected courses.
+    Sections are validated when the courses file is indexed, so the response is
+    serialized straight from dicts unless ?validate=true asks for model checks.
+    """
     try:
         print(f"\n[SCHEDULE GENERATE] Request: {request.course_codes}, filename: {request.json_filename}")
         
-        # Load courses
-        courses_data = load_courses_from_file(request.json_filename)
+        # Load courses: sections grouped by code, built once per file version. The file
+        # is resolved once in the worker thread so "latest" can't change in between
+        courses_by_code = await asyncio.to_thread(load_courses_index_from_file, request.json_filename)
         
-        if not courses_data:
+        if courses_by_code is None:
             print(f"[ERROR] No courses data found for filename: {request.json_filename}")
             raise HTTPException(status_code=404, detail="No courses data found")
         
-        print(f"\n{'='*70}")
-        print(f"[SCHEDULE GENERATION] Starting with {len(request.course_codes)} requested courses")
-        print(f"{'='*70}")
-        
-        # Filter out DISSOLVED courses and group by code
-        courses_by_code = {}
-        for course in courses_data:
-            status = course.get("status", "").upper()
-            if status == "DISSOLVED":
-                continue
-            
-            code = course.get("code", "").split(" - Group")[0]
-            if code not in courses_by_code:
-                courses_by_code[code] = []
-            courses_by_code[code].append(course)
-        
-        print(f"[INFO] Loaded {len(courses_by_code)} unique course codes from database\n")
+        if request.debug:
+            print(f"[INFO] Loaded {len(courses_by_code)} unique course codes from database\n")
         
         # Filter to selected courses only
         selected_dict = {}
         for code in request.course_codes:
             if code in courses_by_code:
                 selected_dict[code] = courses_by_code[code]
-                # Log available sections for debugging
-                print(f"[COURSE: {code}] - {len(courses_by_code[code])} sections:")
-                for i, section in enumerate(courses_by_code[code], 1):
-                    sched = section.get('schedule', 'TBA')
-                    status_val = section.get('status', 'UNKNOWN')
-                    enrolled = section.get('enrolled', '?/?')
-                    group = section.get('code', '').split(' - ')[-1]
-                    print(f"  [{i:2d}] {group:10s} | {sched:25s} | {status_val:15s} | Enrolled: {enrolled}")
+                if request.debug:
+                    # Log available sections for debugging
+                    print(f"[COURSE: {code}] - {len(courses_by_code[code])} sections:")
+                    for i, section in enumerate(courses_by_code[code], 1):
+                        sched = section.get('schedule', 'TBA')
+                        status_val = section.get('status', 'UNKNOWN')
+                        enrolled = section.get('enrolled', '?/?')
+                        group = section.get('code', '').rpartition(' - ')[2]
+                        print(f"  [{i:2d}] {group:10s} | {sched:25s} | {status_val:15s} | Enrolled: {enrolled}")
             else:
                 raise HTTPException(
                     status_code=400,
@@ -500,63 +1003,62 @@ async def generate_schedules(request: GenerateSchedulesRequest):
                 )
         
         # Generate combinations
-        print(f"\n{'='*70}")
-        print(f"[GENERATION] Building permutations...")
-        print(f"{'='*70}")
-        
         start_time = time.time()
-        # Enable debug if no results expected
-        debug_mode = len(selected_dict) > 1
+        # Per-rejection conflict logging is only useful when debugging a request
+        debug_mode = request.debug and len(selected_dict) > 1
         
         try:
-            combinations_raw = generate_schedule_combinations(
-                selected_dict,
-                max_combinations=request.max_combinations,
-                debug=debug_mode
+            # CPU-bound search runs in a worker process so the event loop stays free
+            combinations_raw, truncated = await asyncio.get_running_loop().run_in_executor(
+                get_schedule_pool(),
+                partial(
+                    generate_schedule_combinations,
+                    selected_dict,
+                    max_combinations=request.max_combinations,
+                    debug=debug_mode,
+                    skip_full=request.skip_full,
+                    return_truncated=True
+                )
             )
         except Exception as e:
             print(f"[ERROR] generate_schedule_combinations failed: {str(e)}")
-            import traceback
             traceback.print_exc()
             raise
         
-        print(f"\n[RESULT] ✓ Generated {len(combinations_raw)} valid combinations")
-        print(f"{'='*70}\n")
+        print(f"[RESULT] ✓ Generated {len(combinations_raw)} valid combinations")
+        if truncated:
+            logging.warning(f"Schedule search for {request.course_codes} hit its node budget; results may be incomplete")
         
-        # Add status to each combination and ensure no conflicts
-        combinations = []
-        for i, combo in enumerate(combinations_raw):
-            try:
-                status_info = get_schedule_status(combo)
-                combinations.append(ScheduleCombination(
-                    courses=[Course(**c) for c in combo],
-                    status=status_info["status"],
-                    full_courses=status_info["full_courses"]
-                ))
-            except Exception as e:
-                print(f"[ERROR] Failed to process combination {i}: {str(e)}")
-                print(f"[DEBUG] Combo data: {combo}")
-                import traceback
-                traceback.print_exc()
-                raise
+        # Add status to each combination (model building can be thousands of items)
+        if validate:
+            combinations = await asyncio.to_thread(build_schedule_combinations, combinations_raw)
+        else:
+            combinations = schedule_combination_dicts(combinations_raw)
         
         elapsed = time.time() - start_time
         
         # Final validation: log if any schedules were filtered out due to unexpected conflicts
         if len(combinations) == 0 and len(selected_dict) > 0:
-            import logging
             logging.warning(f"No valid schedules generated for {len(selected_dict)} courses")
         
+        if not validate:
+            return ORJSONResponse(content={
+                "combinations": combinations,
+                "generation_time": round(elapsed, 3),
+                "count": len(combinations),
+                "truncated": truncated
+            })
+        
         return GenerateSchedulesResponse(
             combinations=combinations,
             generation_time=round(elapsed, 3),
-            count=len(combinations)
+            count=len(combinations),
+            truncated=truncated
         )
         
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
         print(f"[ERROR] Schedule generation failed: {str(e)}")
         print(traceback.format_exc())
         raise HTTPException(status_code=500, detail=str(e))
@@ -567,16 +1069,15 @@ async def get_available_json_files():
     """Get list of available JSON course files"""
     try:
         print(f"[FILES] Looking for JSON files in: {JSON_DIR}")
-        json_files = [f for f in os.listdir(JSON_DIR) if f.endswith('.json')]
-        print(f"[FILES] Found {len(json_files)} files: {json_files}")
+        json_files = await asyncio.to_thread(scan_json_files)
+        print(f"[FILES] Found {len(json_files)} files: {[e.name for e in json_files]}")
         files_info = []
         
-        for filename in json_files:
-            filepath = os.path.join(JSON_DIR, filename)
-            stat = os.stat(filepath)
+        for entry in json_files:
+            stat = entry.stat()
             files_info.append({
-                "filename": filename,
-                "path": filepath,
+                "filename": entry.name,
+                "path": entry.path,
                 "size": stat.st_size,
                 "modified": datetime.fromtimestamp(stat.st_mtime).isoformat()
             })
@@ -594,7 +1095,7 @@ async def get_available_json_files():
 
 
 @app.get("/api/schedules/load/{filename}")
-async def load_courses_file_endpoint(filename: str):
+async def load_courses_file_endpoint(request: Request, filename: str):
     """Load courses from a specific JSON file"""
     try:
         # Security: prevent directory traversal
@@ -604,12 +1105,19 @@ async def load_courses_file_endpoint(filename: str):
         filepath = os.path.join(JSON_DIR, filename)
         
         # Check if file exists
-        if not os.path.exists(filepath) or not filepath.endswith('.json'):
+        if not os.path.exists(filepath) or not filepath.endswith(COURSE_FILE_SUFFIXES):
             raise HTTPException(status_code=404, detail=f"File not found: {filename}")
         
-        # Read and parse the JSON file
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        cached = await asyncio.to_thread(not_modified_response, request, filepath)
+        if cached is not None:
+            return cached
+        
+        # Read and parse the JSON file (served from cache while unchanged)
+        data = await asyncio.to_thread(read_json_file, filepath)
+        
+        # Plain course lists (what the scraper writes) are served pre-serialized
+        if isinstance(data, list):
+            return await asyncio.to_thread(courses_response, filepath, True)
         
         # Extract courses data
         courses = data.get('courses', []) if isinstance(data, dict) else data
@@ -623,7 +1131,7 @@ async def load_courses_file_endpoint(filename: str):
         return CoursesResponse(
             courses=courses,
             count=len(courses),
-            unique_codes=len(set(c.get('code', '').split(' - ')[0] for c in courses if isinstance(c, dict) and c.get('code'))),
+            unique_codes=count_unique_codes(courses),
             last_updated=last_updated
         )
     except HTTPException:
@@ -649,5 +1157,8 @@ if __name__ == "__main__":
         app,
         host="0.0.0.0",
         port=5000,
-        log_level="info"
+        log_level="info",
+        # uvloop/httptools ship with uvicorn[standard]; uvloop has no Windows build
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
     )
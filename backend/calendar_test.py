@@ -88,6 +88,43 @@ DUMMY_COURSES = [
 # PARSING FUNCTIONS (copied from main file)
 # ============================================================================
 
+# Day codes the calendar renders, for O(1) membership checks while parsing
+DAY_ABBREV_SET = frozenset("MTWRFSU")
+
+# Single-letter codes keyed by the first three letters of a day name; every
+# full name starts with its 3-letter form, so one lookup covers both
+DAY_NAME_PREFIXES = {
+    "MON": "M", "TUE": "T", "WED": "W", "THU": "R",
+    "FRI": "F", "SAT": "S", "SUN": "U"
+}
+
+
+def day_code_for_name(day_name: str) -> str:
+    """Maps an upper-case day name (Mon, TUESDAY, Th...) to its letter code, or "" if unknown"""
+    code = DAY_NAME_PREFIXES.get(day_name[:3])
+    if code:
+        return code
+    # Bare "TH" (as in "TTh") still means Thursday
+    return "R" if day_name.startswith("TH") else ""
+
+
+def to_24_hour(hour: int, ampm, assume_pm: bool = False) -> int:
+    """
+    Converts a 12-hour clock hour to 24-hour time using its AM/PM marker.
+    Without a marker the hour is kept, unless assume_pm is set and it is 1-7.
+    """
+    if ampm:
+        ampm = ampm.upper()
+        if ampm == "PM" and hour < 12:
+            return hour + 12
+        if ampm == "AM" and hour == 12:
+            return 0
+        return hour
+    if assume_pm and 1 <= hour < 8:
+        return hour + 12
+    return hour
+
+
 def parse_schedule(schedule_str: str):
     """
     Parses a schedule string like "MWF 10:00-12:00" or "Sat 07:30 AM - 10:30 AM" into structured data.
@@ -100,17 +137,6 @@ def parse_schedule(schedule_str: str):
     schedule_str = schedule_str.strip()
     print(f"  → Parsing: '{schedule_str}'")
     
-    # Mapping from full/3-letter day names to single-letter codes
-    day_mapping = {
-        "MONDAY": "M", "MON": "M",
-        "TUESDAY": "T", "TUE": "T",
-        "WEDNESDAY": "W", "WED": "W",
-        "THURSDAY": "R", "THU": "R", "TH": "R",  # Added "TH" for "TTh" pattern
-        "FRIDAY": "F", "FRI": "F",
-        "SATURDAY": "S", "SAT": "S",
-        "SUNDAY": "U", "SUN": "U"
-    }
-    
     # Try matching with single-letter abbreviations first (MWF, TTh, MW, etc.)
     # Updated pattern to handle "TTh" style (capital + lowercase) and capture AM/PM for each time
     match = re.match(r"([MTWRFSUmtwrfsu]+h?)\s+(\d{1,2}):(\d{2})\s*(AM|PM)?\s*-\s*(\d{1,2}):(\d{2})\s*(AM|PM)?", schedule_str, re.IGNORECASE)
@@ -128,18 +154,6 @@ def parse_schedule(schedule_str: str):
         days_str = days_str.replace("TH", "R").replace("H", "")
         
         print(f"  → Matched single-letter pattern: days={days_str}, time={start_hour}:{start_min} {start_ampm or ''}- {end_hour}:{end_min} {end_ampm or ''}")
-        
-        # Convert to 24-hour format based on AM/PM markers
-        if start_ampm and start_ampm.upper() == "PM" and start_hour < 12:
-            start_hour += 12
-        if end_ampm and end_ampm.upper() == "PM" and end_hour < 12:
-            end_hour += 12
-        # If no AM/PM specified and hour is low (1-7), assume PM
-        elif not start_ampm and not end_ampm:
-            if start_hour < 8 and start_hour >= 1:
-                start_hour += 12
-            if end_hour < 8 and end_hour >= 1:
-                end_hour += 12
     else:
         # Try matching with full/3-letter day names (Mon, Tue, Sat, etc.)
         match = re.match(r"([A-Za-z]+)\s+(\d{1,2}):(\d{2})\s*(AM|PM)?\s*-\s*(\d{1,2}):(\d{2})\s*(AM|PM)?", schedule_str, re.IGNORECASE)
@@ -159,28 +173,19 @@ def parse_schedule(schedule_str: str):
         print(f"  → Matched full day pattern: days={days_input}, time={start_hour}:{start_min} {start_ampm or ''}- {end_hour}:{end_min} {end_ampm or ''}")
         
         # Convert full day names to single-letter codes
-        days_str = ""
-        for day_name, day_code in day_mapping.items():
-            if days_input.startswith(day_name):
-                days_str = day_code
-                print(f"  → Converted {days_input} → {day_code}")
-                break
+        days_str = day_code_for_name(days_input)
+        if days_str:
+            print(f"  → Converted {days_input} → {days_str}")
         
         if not days_str:
             print(f"  → ❌ Failed to convert day name: {days_input}")
             return None
-        
-        # Convert to 24-hour format based on AM/PM markers
-        if start_ampm and start_ampm.upper() == "PM" and start_hour < 12:
-            start_hour += 12
-        if end_ampm and end_ampm.upper() == "PM" and end_hour < 12:
-            end_hour += 12
-        # If no AM/PM specified and hour is low (1-7), assume PM
-        elif not start_ampm and not end_ampm:
-            if start_hour < 8 and start_hour >= 1:
-                start_hour += 12
-            if end_hour < 8 and end_hour >= 1:
-                end_hour += 12
+    
+    # Convert to 24-hour format based on AM/PM markers
+    # If neither time has AM/PM and an hour is low (1-7), assume PM
+    assume_pm = not start_ampm and not end_ampm
+    start_hour = to_24_hour(start_hour, start_ampm, assume_pm)
+    end_hour = to_24_hour(end_hour, end_ampm, assume_pm)
     
     # Check if schedule has AM/PM indicators (legacy check removed - now handled above)
     # Convert to minutes for easier comparison
@@ -206,8 +211,9 @@ def generate_simple_calendar_html(courses: list):
     day_abbrev = ['M', 'T', 'W', 'R', 'F', 'S', 'U']
     
     # Parse all courses
-    course_by_day_time = {}
+    course_slots = []  # One entry per (course, day) block on the calendar
     color_map = {}
+    active_courses = []  # Non-dissolved courses, reused for the course list
     min_time = 24 * 60
     max_time = 0
     parsed_count = 0
@@ -229,6 +235,7 @@ def generate_simple_calendar_html(courses: list):
         if status.upper() == "DISSOLVED":
             print(f"  → ⏭ SKIPPED (DISSOLVED)")
             continue
+        active_courses.append(course)
         
         parsed = parse_schedule(schedule)
         
@@ -243,15 +250,15 @@ def generate_simple_calendar_html(courses: list):
                 max_time = parsed["end"]
             
             for day in parsed["days"]:
-                if day not in day_abbrev:
+                if day not in DAY_ABBREV_SET:
                     continue
-                key = (day, parsed["start"], parsed["end"], code)
-                course_by_day_time[key] = {
+                course_slots.append({
+                    "day": day,
                     "code": code,
                     "start": parsed["start"],
                     "end": parsed["end"],
                     "color": color_map[code]
-                }
+                })
             print(f"  → ✓ Added to calendar")
         else:
             failed_count += 1
@@ -262,7 +269,7 @@ def generate_simple_calendar_html(courses: list):
     print(f"="*60)
     print(f"✓ Successfully parsed: {parsed_count}")
     print(f"❌ Failed to parse: {failed_count}")
-    print(f"📚 Total courses in calendar: {len(course_by_day_time)}")
+    print(f"📚 Total courses in calendar: {len(course_slots)}")
     print()
     
     # Ensure reasonable default time range
@@ -274,8 +281,13 @@ def generate_simple_calendar_html(courses: list):
     min_time = (min_time // 30) * 30
     max_time = ((max_time + 29) // 30) * 30
     
-    # Build HTML
-    html = """<!DOCTYPE html>
+    # Bucket the calendar entries by day so each cell only scans its own day
+    by_day = {day: [] for day in day_abbrev}
+    for slot in course_slots:
+        by_day[slot["day"]].append(slot)
+    
+    # Build HTML as a list of parts joined once at the end
+    parts = ["""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -355,7 +367,7 @@ def generate_simple_calendar_html(courses: list):
             <h3>Test Summary:</h3>
             <p>✓ Successfully parsed: """ + str(parsed_count) + """</p>
             <p>❌ Failed to parse: """ + str(failed_count) + """</p>
-            <p>📚 Time slots in calendar: """ + str(len(course_by_day_time)) + """</p>
+            <p>📚 Time slots in calendar: """ + str(len(course_slots)) + """</p>
             <p>⏰ Time range: """ + f"{min_time//60:02d}:{min_time%60:02d} - {max_time//60:02d}:{max_time%60:02d}" + """</p>
         </div>
         
@@ -375,50 +387,46 @@ def generate_simple_calendar_html(courses: list):
                     </tr>
                 </thead>
                 <tbody>
-"""
+"""]
     
-    # Generate time slots
-    time_slot = min_time
-    while time_slot <= max_time:
-        hours = time_slot // 60
-        minutes = time_slot % 60
-        time_str = f"{hours:02d}:{minutes:02d}"
-        
-        html += f"                    <tr>\n                        <td>{time_str}</td>\n"
+    # Generate time slots, with their labels formatted up front
+    time_slots = [(t, f"{t // 60:02d}:{t % 60:02d}") for t in range(min_time, max_time + 1, 30)]
+    for time_slot, time_str in time_slots:
+        parts.append(f"                    <tr>\n                        <td>{time_str}</td>\n")
         
         for day_abbrev_char in day_abbrev:
             cell_content = ""
             
-            for key, data in course_by_day_time.items():
-                if key[0] == day_abbrev_char and data["start"] <= time_slot < data["end"]:
+            for data in by_day[day_abbrev_char]:
+                if data["start"] <= time_slot < data["end"]:
                     cell_content = f'<div class="course-block" style="border-left-color: {data["color"]}; background: {data["color"]};">{data["code"]}</div>'
                     break
             
-            html += f"                        <td>{cell_content}</td>\n"
+            parts.append(f"                        <td>{cell_content}</td>\n")
         
-        html += "                    </tr>\n"
-        time_slot += 30
+        parts.append("                    </tr>\n")
     
-    html += """                </tbody>
+    parts.append("""                </tbody>
             </table>
         </div>
         
         <div class="info" style="margin-top: 20px;">
             <h3>Course List:</h3>
             <ul>
-"""
+""")
     
-    for course in courses:
-        if course["status"].upper() != "DISSOLVED":
-            html += f"                <li><strong>{course['code']}</strong> - {course['schedule']} - {course['room']} - {course['teacher']}</li>\n"
+    parts.append("".join(
+        f"                <li><strong>{course['code']}</strong> - {course['schedule']} - {course['room']} - {course['teacher']}</li>\n"
+        for course in active_courses
+    ))
     
-    html += """            </ul>
+    parts.append("""            </ul>
         </div>
     </div>
 </body>
-</html>"""
+</html>""")
     
-    return html
+    return "".join(parts)
 
 
 # ============================================================================
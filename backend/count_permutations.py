@@ -3,7 +3,11 @@
 import sys
 sys.path.insert(0, '/Users/rapha/OneDrive/Desktop/Personal/Projects/ISMIS_Scheduler/backend')
 
-from ismis_scheduler import generate_schedule_combinations, parse_schedule, schedules_conflict
+from heapq import merge
+from itertools import islice, product
+from math import prod
+
+from ismis_scheduler import generate_schedule_combinations, packed_schedule, parse_schedule, schedules_conflict
 
 # Your sample data - EXCLUDING DISSOLVED
 sample_data = {
@@ -95,12 +99,29 @@ def build_courses_dict(data_dict):
     for code, groups in data_dict.items():
         courses_by_code[code] = []
         for group_name, schedule in groups:
+            # Base code and group stored up front so the analysis loops don't re-split "code"
             courses_by_code[code].append({
                 "code": f"{code} - {group_name}",
-                "schedule": schedule
+                "schedule": schedule,
+                "_base_code": code,
+                "_group": group_name
             })
     return courses_by_code
 
+def build_slot_classes(courses_by_code):
+    """
+    Groups each course's sections by parsed schedule. Sections in one class are
+    interchangeable for conflict checks, so combinations only need enumerating
+    over one representative per class. Returns {code: [[section, ...], ...]}.
+    """
+    slot_classes = {}
+    for code, sections in courses_by_code.items():
+        classes = {}
+        for section in sections:
+            classes.setdefault(packed_schedule(section["schedule"]), []).append(section)
+        slot_classes[code] = list(classes.values())
+    return slot_classes
+
 print("=" * 80)
 print("PERMUTATION ANALYSIS - NO DISSOLVED COURSES")
 print("=" * 80)
@@ -119,26 +140,42 @@ for code in courses.keys():
 
 print(f"\nRaw permutations (if no conflicts): {raw_total:,}")
 
+# Collapse sections with identical schedules into one representative each
+slot_classes = build_slot_classes(courses)
+print("\nDistinct time slots per course:")
+for code in sorted(slot_classes.keys()):
+    print(f"  {code:12} :  {len(slot_classes[code]):2d} slots")
+
+representatives = {code: [cls[0] for cls in classes] for code, classes in slot_classes.items()}
+class_of = {id(cls[0]): cls for classes in slot_classes.values() for cls in classes}
+section_index = {id(section): i for sections in courses.values() for i, section in enumerate(sections)}
+
 # Generate actual valid combinations
 print(f"\n{'='*80}")
 print(f"Generating valid combinations (with conflict filtering)...")
 print(f"{'='*80}\n")
 
-combos = generate_schedule_combinations(courses, max_combinations=100000, debug=True)
+slot_combos = generate_schedule_combinations(representatives, max_combinations=100000, debug=True)
+# Each valid slot combination stands for every pick of one section per chosen slot
+class_combos = [[class_of[id(rep)] for rep in combo] for combo in slot_combos]
+total_valid = sum(prod(len(cls) for cls in combo) for combo in class_combos)
 
 print(f"\n{'='*80}")
-print(f"✓ TOTAL VALID PERMUTATIONS: {len(combos):,}")
+print(f"✓ TOTAL VALID PERMUTATIONS: {total_valid:,}")
 print(f"{'='*80}")
 
 # Analysis by course
 print("\nBreakdown of which sections appear in combinations:")
 for code in sorted(courses.keys()):
     sections_used = {}
-    for combo in combos:
-        for course in combo:
-            if code in course["code"]:
-                group = course["code"].split(" - ")[1]
-                sections_used[group] = sections_used.get(group, 0) + 1
+    for combo in class_combos:
+        weight = prod(len(cls) for cls in combo)
+        for cls in combo:
+            if cls[0]["_base_code"] == code:
+                # Each section of the slot appears in an equal share of the expansions
+                for course in cls:
+                    group = course["_group"]
+                    sections_used[group] = sections_used.get(group, 0) + weight // len(cls)
     
     print(f"\n{code} ({len(sections_used)} of {len(courses[code])} sections used):")
     for group in sorted(sections_used.keys(), key=lambda x: int(x.split()[-1])):
@@ -158,10 +195,15 @@ print(f"\n{'='*80}")
 print("Sample valid combinations:")
 print(f"{'='*80}")
 
-for idx, combo in enumerate(combos[:10], 1):
+# Expand slot combinations lazily, merged back into section order
+expanded_combos = merge(
+    *(product(*combo) for combo in class_combos),
+    key=lambda combo: [section_index[id(section)] for section in combo]
+)
+for idx, combo in enumerate(islice(expanded_combos, 10), 1):
     print(f"\n#{idx}:")
     for course in sorted(combo, key=lambda x: x["code"]):
-        code = course["code"].split(" - ")[0]
-        group = course["code"].split(" - ")[1]
+        code = course["_base_code"]
+        group = course["_group"]
         sched = course["schedule"]
         print(f"  {code:12} {group:10s} | {sched}")
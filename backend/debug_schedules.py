@@ -40,7 +40,11 @@ def main():
         if status == "DISSOLVED":
             continue
         
-        code = course.get('code', '').split(' - Group')[0]
+        full_code = course.get('code', '')
+        code = full_code.split(' - Group')[0]
+        # Stored once so the loops below read fields instead of re-splitting "code"
+        course['_base_code'] = code
+        course['_group'] = full_code.split(' - ')[-1]
         if code not in codes_dict:
             codes_dict[code] = []
         codes_dict[code].append(course)
@@ -62,7 +66,7 @@ def main():
             status = section.get('status', 'UNKNOWN')
             enrolled = section.get('enrolled', '?/?')
             parsed = parse_schedule(sched)
-            group = section.get('code', '').split(' - ')[-1]
+            group = section['_group']
             
             print(f"[{i:2d}] {group:10s} | {sched:25s} | Status: {status:15s}")
             if parsed:
@@ -97,8 +101,8 @@ def main():
         
         for combo in combinations:
             for course in combo:
-                code = course.get('code', '').split(' - Group')[0]
-                group = course.get('code', '').split(' - ')[-1]
+                code = course['_base_code']
+                group = course['_group']
                 if code == test_codes[0]:
                     used_sections_0.add(group)
                 else:
@@ -109,7 +113,7 @@ def main():
         
         unused_0 = set()
         for i, section in enumerate(codes_dict[test_codes[0]], 1):
-            group = section.get('code', '').split(' - ')[-1]
+            group = section['_group']
             if group not in used_sections_0:
                 unused_0.add(group)
         
@@ -117,7 +121,7 @@ def main():
             print(f"\nSections of {test_codes[0]} NOT USED: {sorted(unused_0)}")
             print("\nDetails of unused sections:")
             for i, section in enumerate(codes_dict[test_codes[0]], 1):
-                group = section.get('code', '').split(' - ')[-1]
+                group = section['_group']
                 if group in unused_0:
                     sched = section.get('schedule', 'TBA')
                     print(f"  {group}: {sched}")
@@ -3,11 +3,15 @@
 # ============================================================================
 
 from playwright.sync_api import sync_playwright, Page, expect
+from playwright.async_api import Page as AsyncPage, expect as async_expect
 import re
 import json
+import orjson
 import time
 import random
 import os
+from collections import Counter
+from functools import lru_cache
 
 
 # ============================================================================
@@ -29,26 +33,56 @@ HTML_DIR = os.path.join(GENERATED_DIR, "html")
 POLITE_MIN_DELAY = 0.4
 POLITE_MAX_DELAY = 0.9
 
+# Adaptive pausing: once response times have been measured, polite_pause() sleeps
+# a fraction of their moving average instead of the fixed range above, so a fast
+# server isn't kept waiting and a slow one gets more room
+POLITE_LATENCY_FACTOR = 0.3
+POLITE_ADAPTIVE_FLOOR = 0.06
+POLITE_JITTER = 0.2
+POLITE_EMA_ALPHA = 0.3
+_latency_ema = None
 
-def polite_pause(min_s=POLITE_MIN_DELAY, max_s=POLITE_MAX_DELAY):
+# Requests the scraper never needs: images, fonts, media, manifests, subtitles and
+# trackers. Stylesheets stay: without them the icon-only filter/search buttons
+# (i.fa-calendar, i.fa-search) have no size and can't be clicked.
+# Playwright matches route regexes in the browser, so only these requests are paused
+# and handed to Python; everything else loads without a round trip to the route handler.
+# Must stay a JavaScript-compatible pattern for that reason.
+BLOCKED_URL_PATTERN = re.compile(
+    r"\.(?:png|jpe?g|gif|webp|avif|svg|ico|bmp|woff2?|ttf|otf|eot|mp4|webm|mp3|ogg|wav|webmanifest|vtt)(?:[?#]|$)"
+    r"|google-analytics|googletagmanager|doubleclick|hotjar|facebook\.net",
+    re.IGNORECASE,
+)
+
+
+def polite_pause(min_s=None, max_s=None, last_latency=None):
     """
     Adds a small random delay to avoid hitting the server too aggressively.
+    Pass last_latency (seconds the last request took) to feed the moving average the
+    default pause is based on; an explicit min_s/max_s range always sleeps in that range.
     """
-    time.sleep(random.uniform(min_s, max_s))
+    global _latency_ema
+    if last_latency is not None:
+        if _latency_ema is None:
+            _latency_ema = last_latency
+        else:
+            _latency_ema += POLITE_EMA_ALPHA * (last_latency - _latency_ema)
+    
+    if min_s is not None or max_s is not None or _latency_ema is None:
+        min_s = POLITE_MIN_DELAY if min_s is None else min_s
+        max_s = POLITE_MAX_DELAY if max_s is None else max_s
+        time.sleep(random.uniform(min_s, max_s))
+        return
+    
+    delay = max(POLITE_ADAPTIVE_FLOOR, POLITE_LATENCY_FACTOR * _latency_ema)
+    time.sleep(delay * random.uniform(1 - POLITE_JITTER, 1 + POLITE_JITTER))
 
 
 def setup_page_optimizations(page: Page):
     """
     Speeds up scraping by blocking heavy resources while keeping HTML intact.
     """
-    def handle_route(route):
-        resource_type = route.request.resource_type
-        if resource_type in ("image", "media", "font"):
-            route.abort()
-        else:
-            route.continue_()
-
-    page.route("**/*", handle_route)
+    page.route(BLOCKED_URL_PATTERN, lambda route: route.abort())
     page.set_default_timeout(30000)
     page.set_default_navigation_timeout(45000)
 
@@ -126,6 +160,50 @@ def get_academic_period_choice():
 # SCHEDULE GENERATOR FUNCTIONS
 # ============================================================================
 
+# Schedule patterns for parse_schedule, compiled once rather than looked up in
+# the re module cache on every call. They match upper-cased input, which keeps
+# the regex engine off its case-folding path. "H?" handles the "TTh" style, and
+# AM/PM is captured separately for start and end times.
+SCHEDULE_ABBREV_RE = re.compile(r"([MTWRFSU]+H?)\s+(\d{1,2}):(\d{2})\s*(AM|PM)?\s*-\s*(\d{1,2}):(\d{2})\s*(AM|PM)?")
+SCHEDULE_DAY_NAME_RE = re.compile(r"([A-Z]+)\s+(\d{1,2}):(\d{2})\s*(AM|PM)?\s*-\s*(\d{1,2}):(\d{2})\s*(AM|PM)?")
+
+# Single-letter codes keyed by the first three letters of a day name; every
+# full name starts with its 3-letter form, so one lookup covers both
+DAY_NAME_PREFIXES = {
+    "MON": "M", "TUE": "T", "WED": "W", "THU": "R",
+    "FRI": "F", "SAT": "S", "SUN": "U"
+}
+
+# One bit per day letter produced by parse_schedule
+DAY_BITS = {day: 1 << i for i, day in enumerate("MTWRFSU")}
+
+
+def day_code_for_name(day_name: str) -> str:
+    """Maps an upper-case day name (Mon, TUESDAY, Th...) to its letter code, or "" if unknown"""
+    code = DAY_NAME_PREFIXES.get(day_name[:3])
+    if code:
+        return code
+    # Bare "TH" (as in "TTh") still means Thursday
+    return "R" if day_name.startswith("TH") else ""
+
+
+def to_24_hour(hour: int, ampm, assume_pm: bool = False) -> int:
+    """
+    Converts a 12-hour clock hour to 24-hour time using its AM/PM marker.
+    Without a marker the hour is kept, unless assume_pm is set and it is 1-7.
+    """
+    if ampm:
+        ampm = ampm.upper()
+        if ampm == "PM" and hour < 12:
+            return hour + 12
+        if ampm == "AM" and hour == 12:
+            return 0
+        return hour
+    if assume_pm and 1 <= hour < 8:
+        return hour + 12
+    return hour
+
+
 def parse_schedule(schedule_str: str, debug: bool = False):
     """
     Parses a schedule string like "MWF 10:00-12:00" or "Sat 07:30 AM - 10:30 AM" into structured data.
@@ -142,23 +220,37 @@ def parse_schedule(schedule_str: str, debug: bool = False):
     if debug:
         print(f"[PARSE] Processing: {schedule_str}")
     
-    # Mapping from full/3-letter day names to single-letter codes
-    day_mapping = {
-        "MONDAY": "M", "MON": "M",
-        "TUESDAY": "T", "TUE": "T",
-        "WEDNESDAY": "W", "WED": "W",
-        "THURSDAY": "R", "THU": "R", "TH": "R",  # Added "TH" for "TTh" pattern
-        "FRIDAY": "F", "FRI": "F",
-        "SATURDAY": "S", "SAT": "S",
-        "SUNDAY": "U", "SUN": "U"
+    parsed = _parse_schedule_cached(schedule_str.upper())
+    if parsed is None:
+        return None
+    
+    # Build a fresh dict each call so callers never share the cached value
+    days, start_minutes, end_minutes, day_mask = parsed
+    result = {
+        "days": list(days),
+        "start": start_minutes,
+        "end": end_minutes,
+        "day_mask": day_mask
     }
     
+    if debug:
+        print(f"[PARSE] ✓ Success: {result}")
+    
+    return result
+
+
+@lru_cache(maxsize=4096)
+def _parse_schedule_cached(schedule_str: str):
+    """
+    Parsing core for parse_schedule(), memoized per distinct stripped, upper-cased
+    schedule string.
+    Returns an immutable (days, start_minutes, end_minutes, day_mask) tuple, or None if invalid.
+    """
     # Try matching with single-letter abbreviations first (MWF, TTh, MW, etc.)
-    # Pattern includes "h?" to handle "TTh" style and captures AM/PM separately for start and end times
-    match = re.match(r"([MTWRFSUmtwrfsu]+h?)\s+(\d{1,2}):(\d{2})\s*(AM|PM)?\s*-\s*(\d{1,2}):(\d{2})\s*(AM|PM)?", schedule_str, re.IGNORECASE)
+    match = SCHEDULE_ABBREV_RE.match(schedule_str)
     
     if match:
-        days_str = match.group(1).upper()
+        days_str = match.group(1)
         start_hour = int(match.group(2))
         start_min = int(match.group(3))
         start_ampm = match.group(4)  # AM/PM for start time
@@ -168,26 +260,14 @@ def parse_schedule(schedule_str: str, debug: bool = False):
         
         # Normalize "TTh" or "Tth" to "TR" (Tuesday-Thursday)
         days_str = days_str.replace("TH", "R").replace("H", "")
-        
-        # Convert to 24-hour format based on AM/PM markers
-        if start_ampm and start_ampm.upper() == "PM" and start_hour < 12:
-            start_hour += 12
-        if end_ampm and end_ampm.upper() == "PM" and end_hour < 12:
-            end_hour += 12
-        # If no AM/PM specified and hour is low (1-7), assume PM
-        elif not start_ampm and not end_ampm:
-            if start_hour < 8 and start_hour >= 1:
-                start_hour += 12
-            if end_hour < 8 and end_hour >= 1:
-                end_hour += 12
     else:
         # Try matching with full/3-letter day names (Mon, Tue, Sat, etc.)
-        match = re.match(r"([A-Za-z]+)\s+(\d{1,2}):(\d{2})\s*(AM|PM)?\s*-\s*(\d{1,2}):(\d{2})\s*(AM|PM)?", schedule_str, re.IGNORECASE)
+        match = SCHEDULE_DAY_NAME_RE.match(schedule_str)
         
         if not match:
             return None
         
-        days_input = match.group(1).upper()
+        days_input = match.group(1)
         start_hour = int(match.group(2))
         start_min = int(match.group(3))
         start_ampm = match.group(4)  # AM/PM for start time
@@ -196,41 +276,23 @@ def parse_schedule(schedule_str: str, debug: bool = False):
         end_ampm = match.group(7)  # AM/PM for end time
         
         # Convert full day names to single-letter codes
-        days_str = ""
-        for day_name, day_code in day_mapping.items():
-            if days_input.startswith(day_name):
-                days_str = day_code
-                break
+        days_str = day_code_for_name(days_input)
         
         if not days_str:
             return None
-        
-        # Convert to 24-hour format based on AM/PM markers
-        if start_ampm and start_ampm.upper() == "PM" and start_hour < 12:
-            start_hour += 12
-        if end_ampm and end_ampm.upper() == "PM" and end_hour < 12:
-            end_hour += 12
-        # If no AM/PM specified and hour is low (1-7), assume PM
-        elif not start_ampm and not end_ampm:
-            if start_hour < 8 and start_hour >= 1:
-                start_hour += 12
-            if end_hour < 8 and end_hour >= 1:
-                end_hour += 12
     
-    # Convert to minutes for easier comparison
-    start_minutes = start_hour * 60 + start_min
-    end_minutes = end_hour * 60 + end_min
+    # Convert to 24-hour format based on AM/PM markers
+    # If neither time has AM/PM and an hour is low (1-7), assume PM
+    assume_pm = not start_ampm and not end_ampm
+    start_hour = to_24_hour(start_hour, start_ampm, assume_pm)
+    end_hour = to_24_hour(end_hour, end_ampm, assume_pm)
     
-    result = {
-        "days": list(days_str),
-        "start": start_minutes,
-        "end": end_minutes
-    }
+    day_mask = 0
+    for day in days_str:
+        day_mask |= DAY_BITS.get(day, 0)
     
-    if debug:
-        print(f"[PARSE] ✓ Success: {result}")
-    
-    return result
+    # Convert to minutes for easier comparison
+    return tuple(days_str), start_hour * 60 + start_min, end_hour * 60 + end_min, day_mask
 
 
 def is_course_full(course) -> bool:
@@ -238,7 +300,15 @@ def is_course_full(course) -> bool:
     Checks if a course is full based on enrolled/capacity.
     Returns True if enrolled >= capacity.
     """
-    enrolled_str = course.get("enrolled", "0/0")
+    return _enrolled_is_full(course.get("enrolled", "0/0"))
+
+
+@lru_cache(maxsize=4096)
+def _enrolled_is_full(enrolled_str: str) -> bool:
+    """
+    Parsing core for is_course_full(), memoized per distinct "enrolled/capacity"
+    string since the same section is checked once per combination it appears in.
+    """
     try:
         if '/' in enrolled_str:
             parts = enrolled_str.split('/')
@@ -255,10 +325,7 @@ def get_schedule_status(schedule) -> dict:
     Determines if a schedule is available or unavailable.
     Returns dict with 'status' ('available' or 'unavailable') and 'full_courses' list.
     """
-    full_courses = []
-    for course in schedule:
-        if is_course_full(course):
-            full_courses.append(course.get("code", "Unknown"))
+    full_courses = [course.get("code", "Unknown") for course in schedule if is_course_full(course)]
     
     status = "unavailable" if full_courses else "available"
     return {
@@ -283,16 +350,23 @@ def schedules_conflict(sched1, sched2) -> bool:
     if sched1 is None or sched2 is None:
         return False
     
-    # Check if they share any days
-    days1 = set(sched1.get("days", []))
-    days2 = set(sched2.get("days", []))
-    
-    if not days1 or not days2:
-        return False
-    
-    shared_days = days1.intersection(days2)
-    if not shared_days:
-        return False  # No common days, no conflict
+    # Check if they share any days. Schedules from parse_schedule() carry a day
+    # bitmask, so the common no-shared-day case is a single AND.
+    mask1 = sched1.get("day_mask")
+    mask2 = sched2.get("day_mask")
+    if mask1 is not None and mask2 is not None:
+        if not mask1 & mask2:
+            return False  # No common days, no conflict
+    else:
+        days1 = set(sched1.get("days", []))
+        days2 = set(sched2.get("days", []))
+        
+        if not days1 or not days2:
+            return False
+        
+        shared_days = days1.intersection(days2)
+        if not shared_days:
+            return False  # No common days, no conflict
     
     # Check if times overlap on shared days
     # Two times conflict if: start1 < end2 AND start2 < end1
@@ -313,6 +387,37 @@ def schedules_conflict(sched1, sched2) -> bool:
     return False
 
 
+def pack_schedule(parsed):
+    """
+    Encodes a parsed schedule as a (day_mask, start, end) tuple of ints for fast
+    conflict checks. Returns None for schedules schedules_conflict() never flags
+    (TBA, no days, or times outside a day), so callers can skip them outright.
+    """
+    if parsed is None:
+        return None
+    
+    day_mask = parsed.get("day_mask")
+    if day_mask is None:
+        day_mask = 0
+        for day in parsed.get("days", []):
+            day_mask |= DAY_BITS[day]
+    
+    start = parsed.get("start", 0)
+    end = parsed.get("end", 0)
+    if not day_mask or not (0 <= start <= 1440 and 0 <= end <= 1440):
+        return None
+    return day_mask, start, end
+
+
+@lru_cache(maxsize=4096)
+def packed_schedule(schedule_str: str):
+    """
+    pack_schedule(parse_schedule(schedule_str)), pooled per distinct schedule string
+    so every section with the same schedule shares one packed tuple.
+    """
+    return pack_schedule(parse_schedule(schedule_str))
+
+
 def has_schedule_conflict(schedule: list) -> bool:
     """
     Validates if a schedule combination has any conflicts.
@@ -323,16 +428,18 @@ def has_schedule_conflict(schedule: list) -> bool:
     Returns:
         True if any courses conflict, False otherwise
     """
-    for i in range(len(schedule)):
-        for j in range(i + 1, len(schedule)):
-            sched1 = parse_schedule(schedule[i]["schedule"])
-            sched2 = parse_schedule(schedule[j]["schedule"])
-            if schedules_conflict(sched1, sched2):
+    # Parse each section once instead of once per pair
+    parsed = [parse_schedule(course["schedule"]) for course in schedule]
+    for i in range(len(parsed)):
+        for j in range(i + 1, len(parsed)):
+            if schedules_conflict(parsed[i], parsed[j]):
                 return True
     return False
 
 
-def generate_schedule_combinations(courses_by_code: dict, max_combinations: int = 1000, debug: bool = False):
+def generate_schedule_combinations(courses_by_code: dict, max_combinations: int = 1000, debug: bool = False,
+                                   skip_full: bool = False, max_nodes: int = 1_000_000,
+                                   return_truncated: bool = False):
     """
     Generates all valid schedule combinations from selected courses.
     Uses backtracking to build permutations and filters out any with time conflicts.
@@ -341,6 +448,12 @@ def generate_schedule_combinations(courses_by_code: dict, max_combinations: int
         courses_by_code: Dict organized as {course_code: [sections]}
         max_combinations: Stop after finding this many valid schedules
         debug: If True, logs detailed rejection info
+        skip_full: If True, full sections are left out of the search instead of
+            being flagged by get_schedule_status() afterwards
+        max_nodes: Stop after expanding this many partial schedules, so a large
+            selection with few valid combinations still finishes in bounded time
+        return_truncated: If True, return (combinations, truncated), where truncated
+            tells whether max_nodes cut the search short
     
     Returns:
         List of valid schedule combinations with no conflicts
@@ -349,53 +462,118 @@ def generate_schedule_combinations(courses_by_code: dict, max_combinations: int
     valid_schedules = []
     rejected_by_conflict = {code: [] for code in course_codes}
     
-    def backtrack(index: int, current_schedule: list):
-        """Recursively build valid schedules via permutation."""
+    # Parse and pack every section once up front; the search below only needs
+    # day masks and minute ranges.
+    sections_by_course = [courses_by_code[code] for code in course_codes]
+    if skip_full:
+        # Dropping them here narrows every level of the search
+        sections_by_course = [
+            [section for section in sections if not is_course_full(section)]
+            for sections in sections_by_course
+        ]
+    packed_by_course = [
+        [packed_schedule(section["schedule"]) for section in sections]
+        for sections in sections_by_course
+    ]
+    
+    def conflicts(packed, other) -> bool:
+        """Shared day and overlapping times (back-to-back classes are fine)"""
+        return (packed is not None and other is not None and packed[0] & other[0]
+                and packed[1] < other[2] and other[1] < packed[2])
+    
+    # Sets of sections are ints with bit i standing for section i of a course.
+    # compatible[c][i][k] holds the sections of course c + 1 + k that fit
+    # section i of course c; equivalent to schedules_conflict() on the parsed dicts.
+    compatible = [
+        [
+            [
+                sum(1 << j for j, other in enumerate(packed_by_course[d]) if not conflicts(packed, other))
+                for d in range(c + 1, len(course_codes))
+            ]
+            for packed in packed_by_course[c]
+        ]
+        for c in range(len(course_codes))
+    ]
+    last_index = len(course_codes) - 1
+    current_schedule = []
+    current_packed = []
+    nodes_visited = 0
+    truncated = False
+    
+    def backtrack(index: int, domains: list):
+        """
+        Recursively build valid schedules via permutation, with forward checking:
+        domains holds, per remaining course, the sections that still fit every
+        placed section, so a course left with no options ends the branch early.
+        """
+        nonlocal nodes_visited, truncated
         if len(valid_schedules) >= max_combinations:
             return
+        if nodes_visited >= max_nodes:
+            # Only set when a node is actually refused, so a search that ends
+            # exactly on the budget isn't reported as cut short
+            truncated = True
+            return
+        nodes_visited += 1
         
-        # Base case: all courses assigned
+        # Base case: all courses assigned. Every pair was already checked as
+        # sections were placed, so the schedule is conflict-free.
         if index == len(course_codes):
-            # Final validation: ensure no conflicts in the complete schedule
-            if not has_schedule_conflict(current_schedule):
-                valid_schedules.append(current_schedule[:])
+            valid_schedules.append(current_schedule[:])
             return
         
-        # Try each section of the current course
-        course_code = course_codes[index]
-        sections = courses_by_code[course_code]
-        
-        for section in sections:
-            parsed_sched = parse_schedule(section["schedule"])
+        if debug:
+            # Track rejections
+            course_code = course_codes[index]
+            for i, section in enumerate(sections_by_course[index]):
+                if not domains[0] >> i & 1:
+                    conflict_info = next(
+                        scheduled_course.get("code", "Unknown")
+                        for scheduled_course, other in zip(current_schedule, current_packed)
+                        if conflicts(packed_by_course[index][i], other)
+                    )
+                    rejected_by_conflict[course_code].append({
+                        "section": section.get("code", "Unknown"),
+                        "schedule": section.get("schedule", "TBA"),
+                        "conflicted_with": conflict_info
+                    })
+        
+        # Try each section of the current course that fits the placed ones,
+        # in the caller's order
+        sections = sections_by_course[index]
+        remaining_sections = domains[0]
+        while remaining_sections:
+            lowest = remaining_sections & -remaining_sections
+            remaining_sections ^= lowest
+            i = lowest.bit_length() - 1
             
-            # Check for conflicts with already-scheduled courses
-            has_conflict = False
-            conflict_info = None
-            for scheduled_course in current_schedule:
-                sched_to_check = parse_schedule(scheduled_course["schedule"])
-                if schedules_conflict(parsed_sched, sched_to_check):
-                    has_conflict = True
-                    conflict_info = scheduled_course.get("code", "Unknown")
-                    break
-            
-            # If no conflict, add this section and continue building
-            if not has_conflict:
-                current_schedule.append(section)
-                backtrack(index + 1, current_schedule)
+            # Last course: every section left in its domain completes a schedule
+            if index == last_index:
+                current_schedule.append(sections[i])
+                valid_schedules.append(current_schedule[:])
                 current_schedule.pop()
-            else:
-                # Track rejections
-                section_code = section.get("code", "Unknown")
-                rejected_by_conflict[course_code].append({
-                    "section": section_code,
-                    "schedule": section.get("schedule", "TBA"),
-                    "conflicted_with": conflict_info
-                })
+                if len(valid_schedules) >= max_combinations:
+                    return
+                continue
+            
+            narrowed = [domain & fits for domain, fits in zip(domains[1:], compatible[index][i])]
+            if 0 in narrowed:
+                continue
+            
+            current_schedule.append(sections[i])
+            current_packed.append(packed_by_course[index][i])
+            backtrack(index + 1, narrowed)
+            current_schedule.pop()
+            current_packed.pop()
+            if len(valid_schedules) >= max_combinations or truncated:
+                return
     
     if debug:
         print(f"\n[BACKTRACK] Attempting to build combinations for {len(course_codes)} courses")
-    backtrack(0, [])
-    
+    backtrack(0, [(1 << len(sections)) - 1 for sections in sections_by_course])
+
+    if truncated:
+        print(f"[BACKTRACK] Stopped after {max_nodes} search nodes; results may be incomplete")
     if debug:
         print(f"[BACKTRACK] Generated {len(valid_schedules)} valid combinations")
         for code, rejections in rejected_by_conflict.items():
@@ -404,6 +582,8 @@ def generate_schedule_combinations(courses_by_code: dict, max_combinations: int
                 for rej in rejections:
                     print(f"  - {rej['section']}: {rej['schedule']} (conflicted with {rej['conflicted_with']})")
     
+    if return_truncated:
+        return valid_schedules, truncated
     return valid_schedules
 
 
@@ -422,7 +602,7 @@ def generate_schedule_html(combinations: list):
         "#F7DC6F", "#BB8FCE", "#85C1E2", "#F8B88B", "#A9DFBF"
     ]
     
-    html_content = """<!DOCTYPE html>
+    parts = ["""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -591,7 +771,7 @@ def generate_schedule_html(combinations: list):
         
         <div class="controls">
             <span style="color: white; font-weight: bold; align-self: center;">Schedule Option:</span>
-"""
+"""]
     
     # Add buttons for each schedule
     for i, combo_dict in enumerate(combinations):
@@ -599,20 +779,19 @@ def generate_schedule_html(combinations: list):
         status = combo_dict["status"]
         status_badge = "✓" if status == "available" else "✗"
         status_color = "#4CAF50" if status == "available" else "#f44336"
-        html_content += f'            <button class="{active_class}" data-schedule-index="{i}" onclick="showSchedule({i})" style="position: relative;">Option {i + 1} <span style="color: {status_color}; font-weight: bold; margin-left: 5px;">{status_badge}</span></button>\n'
+        parts.append(f'            <button class="{active_class}" data-schedule-index="{i}" onclick="showSchedule({i})" style="position: relative;">Option {i + 1} <span style="color: {status_color}; font-weight: bold; margin-left: 5px;">{status_badge}</span></button>\n')
     
-    html_content += """        </div>
-"""
+    parts.append("""        </div>
+""")
     
     # Generate calendar for each schedule
     for sched_idx, combo_dict in enumerate(combinations):
         schedule = combo_dict["courses"]
         status = combo_dict["status"]
         full_courses = combo_dict["full_courses"]
-        schedule_html = generate_single_schedule_html(schedule, sched_idx, colors, status, full_courses)
-        html_content += schedule_html
+        parts.append(generate_single_schedule_html(schedule, sched_idx, colors, status, full_courses))
     
-    html_content += """
+    parts.append("""
     <script>
         function showSchedule(index) {
             // Hide all schedules
@@ -645,7 +824,8 @@ def generate_schedule_html(combinations: list):
         }
     </script>
 </body>
-</html>"""
+</html>""")
+    html_content = "".join(parts)
     
     # Create generated folder if it doesn't exist
     os.makedirs(HTML_DIR, exist_ok=True)
@@ -675,8 +855,7 @@ def generate_single_schedule_html(schedule: list, sched_idx: int, colors: list,
     day_abbrev = ['M', 'T', 'W', 'R', 'F', 'S', 'U']
     
     # Parse all courses for this schedule
-    course_by_day_time = {}
-    course_info = {}
+    course_slots = []
     color_map = {}
     min_time = 24 * 60  # Start with max value
     max_time = 0       # Start with min value
@@ -690,12 +869,6 @@ def generate_single_schedule_html(schedule: list, sched_idx: int, colors: list,
         if code not in color_map:
             color_map[code] = colors[len(color_map) % len(colors)]
         
-        course_info[code] = {
-            "teacher": course.get("teacher", "TBA"),
-            "room": course.get("room", "TBA"),
-            "description": course.get("description", "")
-        }
-        
         if parsed:
             parsed_courses += 1
             # Track min/max times for dynamic time slots
@@ -704,16 +877,7 @@ def generate_single_schedule_html(schedule: list, sched_idx: int, colors: list,
             if parsed["end"] > max_time:
                 max_time = parsed["end"]
             
-            for day in parsed["days"]:
-                if day not in day_abbrev:
-                    continue
-                key = (day, parsed["start"], parsed["end"], code)
-                course_by_day_time[key] = {
-                    "code": code,
-                    "start": parsed["start"],
-                    "end": parsed["end"],
-                    "color": color_map[code]
-                }
+            course_slots.append((parsed, code))
         else:
             tba_courses += 1
     
@@ -727,6 +891,24 @@ def generate_single_schedule_html(schedule: list, sched_idx: int, colors: list,
     min_time = (min_time // 30) * 30
     max_time = ((max_time + 29) // 30) * 30  # Round up
     
+    # Fill a day x time-slot grid once so each cell is a direct lookup. The
+    # first course covering a slot keeps it, as the old per-cell scan did.
+    num_slots = (max_time - min_time) // 30 + 1
+    grid = [[""] * num_slots for _ in day_abbrev]
+    for parsed, code in course_slots:
+        color = color_map[code]
+        block = f'<div class="course-block" style="border-left-color: {color}; background: {color};">{code}</div>'
+        # Slots whose start time t satisfies start <= t < end
+        first_slot = -((min_time - parsed["start"]) // 30)
+        end_slot = min(-((min_time - parsed["end"]) // 30), num_slots)
+        for day in parsed["days"]:
+            if day not in day_abbrev:
+                continue
+            row = grid[day_abbrev.index(day)]
+            for slot in range(first_slot, end_slot):
+                if not row[slot]:
+                    row[slot] = block
+    
     # Build schedule summary
     has_visible_courses = parsed_courses > 0
     
@@ -750,7 +932,7 @@ def generate_single_schedule_html(schedule: list, sched_idx: int, colors: list,
             </div>'''
     
     # Build HTML table
-    html = f"""        <div class="schedule-container" id="schedule-{sched_idx}" style="display: {'block' if sched_idx == 0 else 'none'};">
+    parts = [f"""        <div class="schedule-container" id="schedule-{sched_idx}" style="display: {'block' if sched_idx == 0 else 'none'};">
             <div class="schedule-title">
                 Schedule Option {sched_idx + 1}
                 <span style="background: {status_color}; color: white; padding: 4px 12px; border-radius: 20px; font-size: 12px; margin-left: 10px;">{status_badge}</span>
@@ -775,32 +957,15 @@ def generate_single_schedule_html(schedule: list, sched_idx: int, colors: list,
                     </tr>
                 </thead>
                 <tbody>
-"""
+"""]
     
-    # Generate dynamic time slots in 30-minute increments
-    time_slot = min_time
-    while time_slot <= max_time:
-        hours = time_slot // 60
-        minutes = time_slot % 60
-        time_str = f"{hours:02d}:{minutes:02d}"
-        
-        html += f"                    <tr>\n                        <td>{time_str}</td>\n"
-        
-        for day_abbrev_char in day_abbrev:
-            cell_content = ""
-            
-            # Find courses in this time slot
-            for key, data in course_by_day_time.items():
-                if key[0] == day_abbrev_char and data["start"] <= time_slot < data["end"]:
-                    cell_content = f'<div class="course-block" style="border-left-color: {data["color"]}; background: {data["color"]};">{data["code"]}</div>'
-                    break
-            
-            html += f"                        <td>{cell_content}</td>\n"
-        
-        html += "                    </tr>\n"
-        time_slot += 30  # Move to next 30-minute slot
+    # Generate dynamic time slots in 30-minute increments, one string per row
+    time_labels = [f"{t // 60:02d}:{t % 60:02d}" for t in range(min_time, max_time + 1, 30)]
+    for slot, time_str in enumerate(time_labels):
+        cells = "".join([f"                        <td>{row[slot]}</td>\n" for row in grid])
+        parts.append(f"                    <tr>\n                        <td>{time_str}</td>\n{cells}                    </tr>\n")
     
-    html += """                </tbody>
+    parts.append("""                </tbody>
             </table>
             
             <button onclick="toggleDetails(""" + str(sched_idx) + """)">📋 View Course Details</button>
@@ -808,7 +973,7 @@ def generate_single_schedule_html(schedule: list, sched_idx: int, colors: list,
             <div class="course-details" id="details-""" + str(sched_idx) + """">
                 <h3>Course Details:</h3>
                 <ul class="course-list">
-"""
+""")
     
     # Add course details
     for course in schedule:
@@ -823,21 +988,21 @@ def generate_single_schedule_html(schedule: list, sched_idx: int, colors: list,
         if is_course_full(course):
             full_indicator = ' <span style="background: #f44336; color: white; padding: 2px 8px; border-radius: 3px; font-size: 11px;">FULL</span>'
         
-        html += f"""                    <li>
+        parts.append(f"""                    <li>
                         <strong class="course-code">{code}</strong>{full_indicator}
                         <span>⏰ {schedule_str}</span>
                         <span>🏢 {room}</span>
                         <span>👨‍🏫 {teacher}</span>
                         <span>👥 {enrolled}</span>
                     </li>
-"""
+""")
     
-    html += """                </ul>
+    parts.append("""                </ul>
             </div>
         </div>
-"""
+""")
     
-    return html
+    return "".join(parts)
 
 
 def check_slot_availability(selected_dict: dict):
@@ -1024,8 +1189,8 @@ def schedule_generator(filename: str = None):
         if save_choice == "y":
             os.makedirs(JSON_DIR, exist_ok=True)
             output_filename = os.path.join(JSON_DIR, f"schedules_{int(time.time())}.json")
-            with open(output_filename, "w", encoding="utf-8") as f:
-                json.dump(combinations, f, indent=2, ensure_ascii=False)
+            with open(output_filename, "wb") as f:
+                f.write(orjson.dumps(combinations, option=orjson.OPT_INDENT_2))
             print(f"✓ Saved to {output_filename}")
     
     except FileNotFoundError:
@@ -1038,6 +1203,54 @@ def schedule_generator(filename: str = None):
 # SCRAPING FUNCTIONS
 # ============================================================================
 
+def course_from_cells(cells: list) -> dict:
+    """
+    Builds a course dictionary from the text of the first 7 cells of a table row.
+    """
+    code, description, status, teacher, full_schedule, department, enrolled = (
+        cell.strip() for cell in cells[:7]
+    )
+    
+    # Separate schedule into time and room
+    if " " in full_schedule:
+        time_part, _, room_part = full_schedule.rpartition(' ')
+    else:
+        time_part = full_schedule
+        room_part = "TBA"
+    
+    return {
+        "code": code,
+        "description": description,
+        "status": status,
+        "teacher": teacher,
+        "schedule": time_part,
+        "room": room_part,
+        "department": department,
+        "enrolled": enrolled
+    }
+
+
+# Text of the first 7 cells of every table row, read in-page so a whole results
+# page costs one round-trip instead of one inner_text() call per cell
+TABLE_ROW_CELLS_JS = (
+    "() => Array.from(document.querySelectorAll('tbody tr'), "
+    "row => Array.from(row.querySelectorAll('td'), cell => cell.innerText).slice(0, 7))"
+)
+
+# Same rows, polled by wait_for_function after a "next" click: resolves with the
+# new page's rows once the active page number differs from the one passed in,
+# so waiting for the page change and reading it is a single call
+NEXT_PAGE_ROWS_JS = (
+    "(prev) => {\n"
+    "  const el = document.querySelector('ul.pagination li.active a');\n"
+    "  if (!el || el.textContent.trim() === prev) return null;\n"
+    "  const rows = document.querySelectorAll('tbody tr');\n"
+    "  if (!rows.length) return null;\n"
+    "  return Array.from(rows, row => Array.from(row.querySelectorAll('td'), cell => cell.innerText).slice(0, 7));\n"
+    "}"
+)
+
+
 def json_scrape(page: Page):
     """
     Extracts course data from all pages of the table.
@@ -1047,52 +1260,26 @@ def json_scrape(page: Page):
     all_courses = []
     current_page = 1
     seen_codes = set()
+    rows = None
     
     while True:
-        # Wait for table to load
-        page.locator("tbody tr").first.wait_for(state="visible")
-        polite_pause()
+        if rows is None:
+            # Wait for table to load
+            page.locator("tbody tr").first.wait_for(state="visible")
+            polite_pause()
+            rows = page.evaluate(TABLE_ROW_CELLS_JS)
         
-        rows = page.locator("tbody tr").all()
         page_courses = []
         
-        for row in rows:
-            cells = row.locator("td").all()
-            
+        for cells in rows:
             # Skip incomplete rows
             if len(cells) < 7:
                 continue
             
-            # Extract data from each cell
-            code = cells[0].inner_text().strip()
-            description = cells[1].inner_text().strip()
-            status = cells[2].inner_text().strip()
-            teacher = cells[3].inner_text().strip()
-            full_schedule = cells[4].inner_text().strip()
-            department = cells[5].inner_text().strip()
-            enrolled = cells[6].inner_text().strip()
-            
-            # Separate schedule into time and room
-            if " " in full_schedule:
-                time_part, _, room_part = full_schedule.rpartition(' ')
-            else:
-                time_part = full_schedule
-                room_part = "TBA"
+            course = course_from_cells(cells)
             
-            # Build course dictionary
-            course = {
-                "code": code,
-                "description": description,
-                "status": status,
-                "teacher": teacher,
-                "schedule": time_part,
-                "room": room_part,
-                "department": department,
-                "enrolled": enrolled
-            }
-            
-            if code not in seen_codes:
-                seen_codes.add(code)
+            if course["code"] not in seen_codes:
+                seen_codes.add(course["code"])
                 page_courses.append(course)
         
         all_courses.extend(page_courses)
@@ -1108,19 +1295,95 @@ def json_scrape(page: Page):
             except Exception:
                 active_page = str(current_page)
 
+            requested_at = time.perf_counter()
             next_button.first.click()
             current_page += 1
 
-            page.wait_for_function(
-                "(prev) => {\n"
-                "  const el = document.querySelector('ul.pagination li.active a');\n"
-                "  return el && el.textContent.trim() !== prev;\n"
-                "}",
-                arg=active_page,
-                timeout=45000,
-            )
-            page.locator("tbody tr").first.wait_for(state="visible", timeout=45000)
-            polite_pause()
+            rows = page.wait_for_function(NEXT_PAGE_ROWS_JS, arg=active_page, timeout=45000).json_value()
+            polite_pause(last_latency=time.perf_counter() - requested_at)
+        else:
+            # No more pages
+            break
+    
+    return all_courses
+
+
+# ============================================================================
+# ASYNC SCRAPING FUNCTIONS (used by the API server)
+# ============================================================================
+
+# Table rows rendered after the last click_and_wait_for_new_rows() call
+FRESH_ROWS_SELECTOR = "tbody tr:not([data-stale])"
+
+
+async def click_and_wait_for_new_rows(page: AsyncPage, target, timeout: int = 45000):
+    """
+    Clicks target (search / next page) and waits until freshly rendered table rows are visible.
+    Rows already on the page are tagged first, so neither a stale table nor a fixed
+    sleep is needed to know the results have arrived.
+    """
+    await page.evaluate("() => document.querySelectorAll('tbody tr').forEach(r => r.dataset.stale = '1')")
+    await target.click()
+    await page.locator(FRESH_ROWS_SELECTOR).first.wait_for(state="visible", timeout=timeout)
+
+
+async def setup_page_optimizations_async(page: AsyncPage):
+    """
+    Async version of setup_page_optimizations().
+    """
+    async def abort_route(route):
+        await route.abort()
+
+    await page.route(BLOCKED_URL_PATTERN, abort_route)
+    page.set_default_timeout(30000)
+    page.set_default_navigation_timeout(45000)
+
+
+async def json_scrape_async(page: AsyncPage):
+    """
+    Async version of json_scrape(). Extracts course data from all pages of the table.
+    """
+    all_courses = []
+    current_page = 1
+    seen_codes = set()
+    rows = None
+    
+    while True:
+        if rows is None:
+            # Wait for table to load
+            await page.locator("tbody tr").first.wait_for(state="visible")
+            rows = await page.evaluate(TABLE_ROW_CELLS_JS)
+        
+        page_courses = []
+        
+        for cells in rows:
+            # Skip incomplete rows
+            if len(cells) < 7:
+                continue
+            
+            course = course_from_cells(cells)
+            
+            if course["code"] not in seen_codes:
+                seen_codes.add(course["code"])
+                page_courses.append(course)
+        
+        all_courses.extend(page_courses)
+        print(f"    - Page {current_page}: {len(page_courses)} sections")
+        
+        # Check if there's a next page button
+        next_button = page.locator('a[rel="next"]')
+        
+        if await next_button.count() > 0:
+            # Click next page and wait for the active page number to change
+            try:
+                active_page = (await page.locator("ul.pagination li.active a").first.inner_text()).strip()
+            except Exception:
+                active_page = str(current_page)
+
+            await next_button.first.click()
+            current_page += 1
+
+            rows = await (await page.wait_for_function(NEXT_PAGE_ROWS_JS, arg=active_page, timeout=45000)).json_value()
         else:
             # No more pages
             break
@@ -1128,6 +1391,44 @@ def json_scrape(page: Page):
     return all_courses
 
 
+async def scrape_academic_options_async(page: AsyncPage, username: str, password: str):
+    """
+    Async version of scrape_academic_options() that drives an existing page.
+    The caller owns the page (and its browser context) and is responsible for closing it.
+    """
+    # Navigate to login page
+    await page.goto("https://ismis.usc.edu.ph/Account/Login?ReturnUrl=%2F", wait_until="domcontentloaded")
+    
+    # Enter credentials and submit
+    await page.locator("#Username").fill(username)
+    await page.locator("#Password").fill(password)
+    await page.get_by_role("button", name="Login").click()
+    await page.locator("#Username").wait_for(state="hidden", timeout=45000)
+    
+    # Navigate to course schedule page
+    await page.goto("https://ismis.usc.edu.ph/courseschedule/CourseScheduleOfferedIndex", wait_until="domcontentloaded")
+    
+    # Verify successful navigation
+    await async_expect(page).to_have_title(re.compile("Academic Module", re.IGNORECASE))
+    
+    # Open the calendar filter
+    await page.locator("i.fa-calendar").click()
+    await page.locator("#AcademicPeriod").wait_for(state="visible")
+    
+    # Read every option in one round trip per select, skipping empty values
+    period_options = await page.locator("#AcademicPeriod option").evaluate_all(
+        "opts => opts.filter(o => o.value).map(o => ({value: o.value, label: o.innerText}))"
+    )
+    year_options = await page.locator("#AcademicYear option").evaluate_all(
+        "opts => opts.filter(o => o.value).map(o => o.value)"
+    )
+    
+    return {
+        "academic_periods": period_options,
+        "academic_years": year_options
+    }
+
+
 # ============================================================================
 # AUTHENTICATION & NAVIGATION
 # ============================================================================
@@ -1150,9 +1451,10 @@ def scrape_academic_options(username: str, password: str, headless: bool = True)
         # Enter credentials and submit
         page.locator("#Username").fill(username)
         page.locator("#Password").fill(password)
+        requested_at = time.perf_counter()
         page.get_by_role("button", name="Login").click()
         page.locator("#Username").wait_for(state="hidden", timeout=45000)
-        polite_pause()
+        polite_pause(last_latency=time.perf_counter() - requested_at)
         
         # Navigate to course schedule page
         page.goto("https://ismis.usc.edu.ph/courseschedule/CourseScheduleOfferedIndex", wait_until="domcontentloaded")
@@ -1164,31 +1466,13 @@ def scrape_academic_options(username: str, password: str, headless: bool = True)
         page.locator("i.fa-calendar").click()
         polite_pause(0.5, 1.0)
         
-        # Extract academic period options
-        period_options = []
-        period_select = page.locator("#AcademicPeriod option")
-        for i in range(period_select.count()):
-            option = period_select.nth(i)
-            value = option.get_attribute("value")
-            label = option.inner_text()
-            
-            # Skip empty options
-            if value and value != "":
-                period_options.append({
-                    "value": value,
-                    "label": label
-                })
-        
-        # Extract academic year options
-        year_options = []
-        year_select = page.locator("#AcademicYear option")
-        for i in range(year_select.count()):
-            option = year_select.nth(i)
-            value = option.get_attribute("value")
-            
-            # Skip empty options
-            if value and value != "":
-                year_options.append(value)
+        # Read every option in one round trip per select, skipping empty values
+        period_options = page.locator("#AcademicPeriod option").evaluate_all(
+            "opts => opts.filter(o => o.value).map(o => ({value: o.value, label: o.innerText}))"
+        )
+        year_options = page.locator("#AcademicYear option").evaluate_all(
+            "opts => opts.filter(o => o.value).map(o => o.value)"
+        )
         
         browser.close()
         
@@ -1266,9 +1550,10 @@ def scrape_all_courses(headless=False):
         # Enter credentials and submit
         page.locator("#Username").fill(username)
         page.locator("#Password").fill(password)
+        requested_at = time.perf_counter()
         page.get_by_role("button", name="Login").click()
         page.locator("#Username").wait_for(state="hidden", timeout=45000)
-        polite_pause()
+        polite_pause(last_latency=time.perf_counter() - requested_at)
         
         # Navigate to course schedule page
         page.goto("https://ismis.usc.edu.ph/courseschedule/CourseScheduleOfferedIndex")
@@ -1283,11 +1568,12 @@ def scrape_all_courses(headless=False):
         
         # Leave course search empty and click search to get ALL courses
         page.locator("#Courses").fill("")
+        requested_at = time.perf_counter()
         page.locator("i.fa-search").click()
         
         # Wait for results to load
         page.locator("tbody tr").first.wait_for(state="visible", timeout=45000)
-        polite_pause()
+        polite_pause(last_latency=time.perf_counter() - requested_at)
         
         print("Scraping all courses...\n")
         
@@ -1301,8 +1587,8 @@ def scrape_all_courses(headless=False):
         elapsed_time = time.time() - start_time
         
         # Save to dynamically named file
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(all_courses, f, indent=4, ensure_ascii=False)
+        with open(filename, "wb") as f:
+            f.write(orjson.dumps(all_courses, option=orjson.OPT_INDENT_2))
         
         # Count unique course types (without group numbers)
         unique_courses = set()
@@ -1335,10 +1621,11 @@ def login(page: Page, username: str, password: str, courses: list, academic_peri
     # Enter credentials and submit
     page.locator("#Username").fill(username)
     page.locator("#Password").fill(password)
+    requested_at = time.perf_counter()
     page.get_by_role("button", name="Login").click()
     # Wait for post-login UI to be ready
     page.locator("#Username").wait_for(state="hidden", timeout=45000)
-    polite_pause()
+    polite_pause(last_latency=time.perf_counter() - requested_at)
     
     # Navigate to course schedule page
     page.goto("https://ismis.usc.edu.ph/courseschedule/CourseScheduleOfferedIndex", wait_until="domcontentloaded")
@@ -1364,12 +1651,13 @@ def login(page: Page, username: str, password: str, courses: list, academic_peri
         # Clear and fill course search box
         page.locator("#Courses").fill("")
         page.locator("#Courses").fill(course_code)
+        requested_at = time.perf_counter()
         page.locator("i.fa-search").click()
         
         # Wait for results table to refresh
         try:
             page.locator("tbody tr").first.wait_for(state="visible", timeout=45000)
-            polite_pause()
+            polite_pause(last_latency=time.perf_counter() - requested_at)
             
             # Scrape this course's data
             course_data = json_scrape(page)
@@ -1385,8 +1673,8 @@ def login(page: Page, username: str, password: str, courses: list, academic_peri
     elapsed_time = time.time() - start_time
     
     # Save all results to JSON
-    with open("courses.json", "w", encoding="utf-8") as f:
-        json.dump(all_courses, f, indent=4, ensure_ascii=False)
+    with open("courses.json", "wb") as f:
+        f.write(orjson.dumps(all_courses, option=orjson.OPT_INDENT_2))
     
     # Count unique course types (without group numbers)
     unique_courses = set()
@@ -1421,17 +1709,10 @@ def check_duplicates(filename: str = None):
         print(f"\nChecking {filename} for duplicates...\n")
         
         # Track course codes and their occurrences
-        code_count = {}
-        duplicates = []
-        
-        for course in courses:
-            code = course.get("code", "")
-            code_count[code] = code_count.get(code, 0) + 1
+        code_count = Counter(course.get("code", "") for course in courses)
         
         # Find duplicates
-        for code, count in code_count.items():
-            if count > 1:
-                duplicates.append((code, count))
+        duplicates = [(code, count) for code, count in code_count.items() if count > 1]
         
         # Display results
         print(f"{'='*50}")
@@ -1,7 +1,7 @@
 """
 Pydantic models for API request/response validation
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
@@ -22,6 +22,8 @@ class AcademicPeriod(str, Enum):
 
 class AcademicOption(BaseModel):
     """Academic period option with value and label"""
+    model_config = ConfigDict(frozen=True)
+    
     value: str
     label: str
 
@@ -33,7 +35,9 @@ class AcademicOptions(BaseModel):
 
 
 class Course(BaseModel):
-    """Course data model"""
+    """Course data model (frozen so one instance can be shared between responses)"""
+    model_config = ConfigDict(frozen=True)
+    
     code: str
     description: str
     status: str
@@ -99,10 +103,14 @@ class GenerateSchedulesRequest(BaseModel):
     course_codes: List[str] = Field(..., min_items=1)
     max_combinations: int = Field(default=5000, ge=1, le=10000)
     json_filename: Optional[str] = None
+    debug: bool = False  # Log sections and conflict rejections for this request
+    skip_full: bool = False  # Leave full sections out instead of marking schedules unavailable
 
 
 class ScheduleCombination(BaseModel):
     """A single schedule combination"""
+    model_config = ConfigDict(frozen=True)
+    
     courses: List[Course]
     status: str  # "available" or "unavailable"
     full_courses: List[str]
@@ -113,6 +121,7 @@ class GenerateSchedulesResponse(BaseModel):
     combinations: List[ScheduleCombination]
     generation_time: float
     count: int
+    truncated: bool = False  # The search hit its node budget; more combinations may exist
 
 
 class CoursesResponse(BaseModel):
@@ -6,66 +6,99 @@ non-dissolved sections, assuming no time conflicts, where each schedule
 includes exactly one section from each unique course?
 """
 
-from itertools import product
+import re
+from functools import lru_cache
+from heapq import merge
+from itertools import islice, product
+from math import prod
 from typing import List, Dict, Tuple
 
+# Bit offset of each day in a schedule mask: 96 quarter-hour slots per day
+DAY_SLOT_OFFSETS = {day: i * 96 for i, day in enumerate(['M', 'T', 'W', 'Th', 'F', 'Sat', 'Sun'])}
+
+
+def schedule_mask(days: List[str], start: int, end: int):
+    """
+    Encode the quarter-hour slots a schedule occupies as one int, so two schedules
+    conflict exactly when their masks share a bit. Returns None (compare the parsed
+    fields instead) for unknown days, times off the 15-minute grid, or ranges
+    outside a single day.
+    """
+    if (not 0 <= start < end <= 24 * 60 or start % 15 or end % 15
+            or not all(day in DAY_SLOT_OFFSETS for day in days)):
+        return None
+    
+    slots = (1 << (end // 15)) - (1 << (start // 15))
+    mask = 0
+    for day in days:
+        mask |= slots << DAY_SLOT_OFFSETS[day]
+    return mask
+
+
+# Slots to keep free, in schedule_mask() format (bit DAY_SLOT_OFFSETS[day] + minute // 15);
+# sections touching any of them are dropped before the search. E.g.
+# schedule_mask(['F'], 0, 24 * 60) leaves Fridays free. 0 keeps every section.
+PRUNE_MASK = 0
+
+
+# Day token, start time and end time, e.g. 'Sat 07:30 AM - 10:30 AM' (anything after
+# the end time's AM/PM, such as a room, is ignored)
+SCHEDULE_RE = re.compile(r'\s*(\S+)\s+(\d+):(\d+)\s+(\S+)\s+\S+\s+(\d+):(\d+)\s+(\S+)(?:\s|$)')
+
+# Day tokens that expand to more than one day; any other token is its own day
+MULTI_DAY_TOKENS = {'MW': ('M', 'W'), 'TTh': ('T', 'Th')}
+
+# One bit per day, so a shared day is a single AND; unknown day tokens are
+# given the next free bit the first time they are seen
+DAY_BITS = {day: 1 << i for i, day in enumerate(DAY_SLOT_OFFSETS)}
+
+
+def day_bits(days: List[str]) -> int:
+    """Bitwise OR of the DAY_BITS for days"""
+    bits = 0
+    for day in days:
+        if day not in DAY_BITS:
+            DAY_BITS[day] = 1 << len(DAY_BITS)
+        bits |= DAY_BITS[day]
+    return bits
+
+
+def to_minutes(hours: int, minutes: int, period: str) -> int:
+    """Minutes since midnight for a 12-hour time"""
+    if period == 'PM' and hours != 12:
+        hours += 12
+    elif period == 'AM' and hours == 12:
+        hours = 0
+    return hours * 60 + minutes
+
+
 # Parse schedule string to extract days and time range
+@lru_cache(maxsize=None)
 def parse_schedule(schedule_str: str) -> Dict:
-    """Parse schedule like 'Sat 07:30 AM - 10:30 AM' into structured data"""
+    """
+    Parse schedule like 'Sat 07:30 AM - 10:30 AM' into structured data.
+    Memoized: sections sharing a schedule string share one (read-only) result.
+    """
     if not schedule_str or schedule_str == 'N/A':
         return None
     
-    parts = schedule_str.split()
-    if len(parts) < 5:
+    match = SCHEDULE_RE.match(schedule_str)
+    if not match:
         return None
     
-    # Extract day(s)
-    day_part = parts[0]
-    days = []
-    
-    # Map day abbreviations
-    day_map = {
-        'M': 'Monday', 'T': 'Tuesday', 'W': 'Wednesday',
-        'Th': 'Thursday', 'F': 'Friday', 'Sat': 'Saturday', 'Sun': 'Sunday'
-    }
+    day_part, start_h, start_m, start_period, end_h, end_m, end_period = match.groups()
+    days = list(MULTI_DAY_TOKENS.get(day_part, (day_part,)))
     
-    if day_part == 'Sat' or day_part == 'Sun':
-        days = [day_part]
-    elif day_part == 'MW':
-        days = ['M', 'W']
-    elif day_part == 'TTh':
-        days = ['T', 'Th']
-    elif day_part in ['M', 'T', 'W', 'Th', 'F']:
-        days = [day_part]
-    else:
-        # Try to parse complex patterns
-        days = [day_part]
+    start_min = to_minutes(int(start_h), int(start_m), start_period)
+    end_min = to_minutes(int(end_h), int(end_m), end_period)
     
-    # Extract time
-    try:
-        start_time_str = f"{parts[1]} {parts[2]}"  # "07:30 AM"
-        end_time_str = f"{parts[4]} {parts[5]}"    # "10:30 AM"
-        
-        # Convert to minutes since midnight
-        def time_to_minutes(time_str: str) -> int:
-            time_part, period = time_str.split()
-            hours, minutes = map(int, time_part.split(':'))
-            if period == 'PM' and hours != 12:
-                hours += 12
-            elif period == 'AM' and hours == 12:
-                hours = 0
-            return hours * 60 + minutes
-        
-        start_min = time_to_minutes(start_time_str)
-        end_min = time_to_minutes(end_time_str)
-        
-        return {
-            'days': days,
-            'start': start_min,
-            'end': end_min
-        }
-    except:
-        return None
+    return {
+        'days': days,
+        'day_bits': day_bits(days),
+        'start': start_min,
+        'end': end_min,
+        'mask': schedule_mask(days, start_min, end_min)
+    }
 
 
 def schedules_conflict(sched1: Dict, sched2: Dict) -> bool:
@@ -73,9 +106,11 @@ def schedules_conflict(sched1: Dict, sched2: Dict) -> bool:
     if not sched1 or not sched2:
         return False
     
+    if sched1['mask'] is not None and sched2['mask'] is not None:
+        return (sched1['mask'] & sched2['mask']) != 0
+    
     # Check if they share any common days
-    common_days = set(sched1['days']) & set(sched2['days'])
-    if not common_days:
+    if not sched1['day_bits'] & sched2['day_bits']:
         return False
     
     # Check for time overlap on common days
@@ -87,6 +122,15 @@ def has_schedule_conflict(sections: List[Dict]) -> bool:
     """Check if a combination of sections has any time conflicts"""
     schedules = [s['schedule'] for s in sections if s['schedule']]
     
+    # With masks for every schedule, one pass over the running union replaces the pairwise check
+    if all(sched['mask'] is not None for sched in schedules):
+        occupied = 0
+        for sched in schedules:
+            if occupied & sched['mask']:
+                return True
+            occupied |= sched['mask']
+        return False
+    
     for i in range(len(schedules)):
         for j in range(i + 1, len(schedules)):
             if schedules_conflict(schedules[i], schedules[j]):
@@ -95,6 +139,49 @@ def has_schedule_conflict(sections: List[Dict]) -> bool:
     return False
 
 
+def enumerate_valid(section_lists: List[List[Dict]], path: Tuple = (), occupied: int = 0,
+                    unmasked: Tuple = ()):
+    """
+    Depth-first walk choosing one section per course, in course order. A branch is
+    dropped as soon as its newest section conflicts with the ones already chosen,
+    so conflicting prefixes never expand. Yields the same combinations, in the same
+    order, as filtering product(*section_lists) with has_schedule_conflict().
+    
+    occupied is the union of the chosen sections' masks; unmasked holds chosen
+    schedules without a mask, which are compared field by field.
+    """
+    if len(path) == len(section_lists):
+        yield path
+        return
+    
+    for section in section_lists[len(path)]:
+        sched = section['schedule']
+        if not sched:
+            yield from enumerate_valid(section_lists, path + (section,), occupied, unmasked)
+        elif sched['mask'] is not None:
+            if occupied & sched['mask'] or any(schedules_conflict(sched, other) for other in unmasked):
+                continue
+            yield from enumerate_valid(section_lists, path + (section,), occupied | sched['mask'], unmasked)
+        else:
+            if any(schedules_conflict(sched, other['schedule']) for other in path):
+                continue
+            yield from enumerate_valid(section_lists, path + (section,), occupied, unmasked + (sched,))
+
+
+def group_by_schedule(sections: List[Dict]) -> List[List[Dict]]:
+    """
+    Group sections by schedule string in first-seen order; members keep their list order.
+    Sections without a parsed schedule (TBA, N/A, ...) never conflict, so they share
+    one group whatever their string, and a course with no scheduled sections costs
+    a single branch in the search.
+    """
+    groups = {}
+    for section in sections:
+        key = section['schedule_str'] if section['schedule'] else None
+        groups.setdefault(key, []).append(section)
+    return list(groups.values())
+
+
 # Course data
 course_data = {
     'CIS 2106N': [
@@ -198,6 +285,8 @@ def main():
         for section in sections:
             if section['status'] != 'DISSOLVED':
                 schedule = parse_schedule(section['schedule_str'])
+                if schedule and schedule['mask'] and schedule['mask'] & PRUNE_MASK:
+                    continue
                 non_dissolved.append({
                     'course': course_code,
                     'group': section['group'],
@@ -231,17 +320,27 @@ def main():
     course_codes = list(filtered_courses.keys())
     section_lists = [filtered_courses[code] for code in course_codes]
     
-    valid_permutations = []
-    total_checked = 0
-    conflicts_found = 0
+    # Sections sharing a schedule string are interchangeable for conflicts, so
+    # search over one representative per string and weight by group sizes
+    slot_classes = [group_by_schedule(sections) for sections in section_lists]
+    class_of = {id(members[0]): members for classes in slot_classes for members in classes}
+    representatives = [[members[0] for members in classes] for classes in slot_classes]
     
-    for combination in product(*section_lists):
-        total_checked += 1
-        
-        if not has_schedule_conflict(list(combination)):
-            valid_permutations.append(combination)
-        else:
-            conflicts_found += 1
+    # Branch on the courses with the fewest distinct schedules first so conflicts
+    # prune the wide courses early; combos are mapped back to course order after
+    search_order = sorted(range(len(course_codes)), key=lambda c: len(representatives[c]))
+    valid_class_combos = []
+    for combo in enumerate_valid([representatives[c] for c in search_order]):
+        classes = [None] * len(course_codes)
+        for c, section in zip(search_order, combo):
+            classes[c] = class_of[id(section)]
+        valid_class_combos.append(classes)
+    combo_weights = [prod(len(members) for members in combo) for combo in valid_class_combos]
+    valid_count = sum(combo_weights)
+    
+    # Pruned search; every combination under a conflicting prefix counts as a conflict
+    total_checked = raw_permutations
+    conflicts_found = total_checked - valid_count
     
     print(f"\nTotal combinations checked: {total_checked:,}")
     print(f"Combinations with conflicts: {conflicts_found:,}")
@@ -249,13 +348,19 @@ def main():
     print("\n" + "=" * 80)
     print("FINAL ANSWER")
     print("=" * 80)
-    print(f"\nValid schedule permutations: {len(valid_permutations):,}")
+    print(f"\nValid schedule permutations: {valid_count:,}")
     print("\n" + "=" * 80)
     
-    # Show some examples
+    # Show some examples, expanding classes lazily back into the order a plain
+    # product over the section lists would list them
+    position = {id(section): i for sections in section_lists for i, section in enumerate(sections)}
+    valid_permutations = merge(
+        *(product(*combo) for combo in valid_class_combos),
+        key=lambda combo: [position[id(section)] for section in combo]
+    )
     print("\nSAMPLE VALID SCHEDULES (first 5):")
     print("-" * 80)
-    for i, combo in enumerate(valid_permutations[:5], 1):
+    for i, combo in enumerate(islice(valid_permutations, 5), 1):
         print(f"\nSchedule {i}:")
         for section in combo:
             print(f"  {section['course']} - {section['group']}: {section['schedule_str']}")
@@ -265,20 +370,22 @@ def main():
     print("SECTION USAGE STATISTICS")
     print("=" * 80)
     
-    for course_code in course_codes:
-        section_usage = {}
-        for combo in valid_permutations:
-            for section in combo:
-                if section['course'] == course_code:
-                    group = section['group']
-                    section_usage[group] = section_usage.get(group, 0) + 1
-        
+    # One pass over the class combos for every course: each member of a chosen
+    # class appears in an equal share of that combo's schedules
+    usage_by_course = [{} for _ in course_codes]
+    for combo, weight in zip(valid_class_combos, combo_weights):
+        for section_usage, members in zip(usage_by_course, combo):
+            share = weight // len(members)
+            for section in members:
+                group = section['group']
+                section_usage[group] = section_usage.get(group, 0) + share
+    
+    for course_code, section_usage in zip(course_codes, usage_by_course):
         print(f"\n{course_code}:")
         for group in sorted(section_usage.keys()):
             count = section_usage[group]
-            percentage = (count / len(valid_permutations)) * 100
+            percentage = (count / valid_count) * 100
             print(f"  {group}: appears in {count:,} schedules ({percentage:.1f}%)")
 
-
 if __name__ == "__main__":
     main()